@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+CATEGORY_LIST_VERSION_KEY = "core:categories:version"
+CATEGORY_LIST_KEY = "core:categories:list:{version}"
+
+
+def _fresh_version():
+    # Seed from the clock so a version key lost to eviction never comes back
+    # with a number that still has a stale payload cached under it.
+    return int(time.time() * 1000)
+
+
+def get_category_list_version():
+    version = cache.get(CATEGORY_LIST_VERSION_KEY)
+    if version is None:
+        cache.add(CATEGORY_LIST_VERSION_KEY, _fresh_version(), timeout=None)
+        version = cache.get(CATEGORY_LIST_VERSION_KEY)
+    return version
+
+
+def get_cached_category_list():
+    """
+    Return the pre-rendered category list response body, or None on a miss.
+    """
+    return cache.get(CATEGORY_LIST_KEY.format(version=get_category_list_version()))
+
+
+def set_cached_category_list(content, version):
+    timeout = getattr(settings, "CATEGORY_LIST_CACHE_TIMEOUT", 60 * 60)
+    cache.set(CATEGORY_LIST_KEY.format(version=version), content, timeout=timeout)
+
+
+def invalidate_category_list():
+    """
+    Bump the shared version key so every worker stops serving the old payload.
+    """
+    try:
+        cache.incr(CATEGORY_LIST_VERSION_KEY)
+    except ValueError:
+        cache.add(CATEGORY_LIST_VERSION_KEY, _fresh_version(), timeout=None)
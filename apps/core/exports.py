@@ -0,0 +1,61 @@
+import csv
+import json
+
+from django.conf import settings
+
+EXPORT_COLUMNS = {
+    "uuid": lambda product: str(product.uuid),
+    "name": lambda product: product.name,
+    "description": lambda product: product.description,
+    "category": lambda product: product.category.name,
+    "category_uuid": lambda product: str(product.category.uuid),
+    "price": lambda product: str(product.price),
+    "stock": lambda product: product.stock,
+    "is_active": lambda product: product.is_active,
+    "status": lambda product: product.status,
+    "created_by": lambda product: product.created_by.email,
+    "created_at": lambda product: product.created_at.isoformat(),
+    "updated_at": lambda product: product.updated_at.isoformat(),
+}
+
+DEFAULT_EXPORT_COLUMNS = ["uuid", "name", "category", "price", "stock", "status", "created_at"]
+
+
+class Echo(object):
+    """
+    File-like object that hands back whatever is written to it, so csv.writer
+    can format a single row without buffering the whole export.
+    """
+    def write(self, value):
+        return value
+
+
+def iter_products(queryset):
+    chunk_size = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+    return queryset.select_related("category", "created_by").iterator(chunk_size=chunk_size)
+
+
+def stream_csv(queryset, columns):
+    """
+    Yield the export as CSV lines, header first.
+    """
+    writer = csv.writer(Echo())
+    getters = [EXPORT_COLUMNS[column] for column in columns]
+    yield writer.writerow(columns)
+    for product in iter_products(queryset):
+        yield writer.writerow([getter(product) for getter in getters])
+
+
+def stream_ndjson(queryset, columns):
+    """
+    Yield the export as newline delimited JSON objects.
+    """
+    getters = [(column, EXPORT_COLUMNS[column]) for column in columns]
+    for product in iter_products(queryset):
+        yield json.dumps({column: getter(product) for column, getter in getters}) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv", stream_csv),
+    "ndjson": ("application/x-ndjson", "ndjson", stream_ndjson),
+}
@@ -0,0 +1,212 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from apps.core.filters import (
+    AVAILABILITY_CHOICES,
+    PRICE_BANDS,
+    availability_q,
+    get_availability,
+    get_price_band,
+    price_band_q,
+)
+from apps.core.models import Category, Product
+
+FACETS_VERSION_KEY = "core:facets:version"
+FACETS_KEY = "core:facets:{version}:{facet}:{value}"
+FACETS_READY_KEY = "core:facets:{version}:ready"
+
+FACET_FIELDS = ("category_id", "status", "is_active", "price", "stock")
+
+STATUS_VALUES = [status for status, _ in Product.STATUS_CHOICES]
+ACTIVE_VALUES = [True, False]
+PRICE_BAND_VALUES = [band for band, _, _ in PRICE_BANDS]
+
+
+def compute_facets(queryset):
+    """
+    Count ``queryset`` rows per facet value with grouped aggregate queries.
+
+    Returns ``{facet: {value: count}}``; categories are keyed by category id.
+    """
+    facets = {
+        "category": {},
+        "status": dict.fromkeys(STATUS_VALUES, 0),
+        "is_active": dict.fromkeys(ACTIVE_VALUES, 0),
+    }
+    for row in queryset.order_by().values("category_id").annotate(count=Count("id")):
+        facets["category"][row["category_id"]] = row["count"]
+    for row in queryset.order_by().values("status").annotate(count=Count("id")):
+        facets["status"][row["status"]] = row["count"]
+    for row in queryset.order_by().values("is_active").annotate(count=Count("id")):
+        facets["is_active"][row["is_active"]] = row["count"]
+
+    # Price bands and availability are disjoint ranges; one conditional
+    # aggregate counts all of them in a single pass.
+    aggregates = {
+        f"price_band:{band}": Count("id", filter=price_band_q(band)) for band in PRICE_BAND_VALUES
+    }
+    aggregates.update({
+        f"availability:{value}": Count("id", filter=availability_q(value)) for value in AVAILABILITY_CHOICES
+    })
+    totals = queryset.order_by().aggregate(**aggregates)
+    facets["price_band"] = {band: totals[f"price_band:{band}"] for band in PRICE_BAND_VALUES}
+    facets["availability"] = {value: totals[f"availability:{value}"] for value in AVAILABILITY_CHOICES}
+    return facets
+
+
+def _timeout():
+    return getattr(settings, "PRODUCT_FACETS_CACHE_TIMEOUT", 60 * 10)
+
+
+def _version():
+    version = cache.get(FACETS_VERSION_KEY)
+    if version is None:
+        cache.add(FACETS_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(FACETS_VERSION_KEY)
+    return version
+
+
+def _facet_keys(version, category_ids):
+    keys = {}
+    for facet, values in (
+        ("category", category_ids),
+        ("status", STATUS_VALUES),
+        ("is_active", ACTIVE_VALUES),
+        ("price_band", PRICE_BAND_VALUES),
+        ("availability", AVAILABILITY_CHOICES),
+    ):
+        for value in values:
+            keys[FACETS_KEY.format(version=version, facet=facet, value=value)] = (facet, value)
+    return keys
+
+
+def get_cached_facets(categories):
+    """
+    Return global facet counts for ``categories`` (id -> Category) from cache,
+    recomputing them when the cache is cold or a key has been evicted.
+    """
+    version = _version()
+    keys = _facet_keys(version, categories)
+    cached = cache.get_many(list(keys) + [FACETS_READY_KEY.format(version=version)])
+    if len(cached) == len(keys) + 1:
+        facets = {}
+        for key, (facet, value) in keys.items():
+            facets.setdefault(facet, {})[value] = cached[key]
+        return facets
+
+    facets = compute_facets(Product.objects.all())
+    values = {}
+    for key, (facet, value) in keys.items():
+        values[key] = facets[facet].get(value, 0)
+    cache.set_many(values, timeout=_timeout())
+    cache.set(FACETS_READY_KEY.format(version=version), True, timeout=_timeout())
+    for facet, value in keys.values():
+        facets[facet].setdefault(value, 0)
+    return facets
+
+
+def product_facet_row(product):
+    return {field: getattr(product, field) for field in FACET_FIELDS}
+
+
+def product_facet_values(row):
+    """
+    Facet values a product row (a dict of ``FACET_FIELDS``) contributes to.
+    """
+    return [
+        ("category", row["category_id"]),
+        ("status", row["status"]),
+        ("is_active", row["is_active"]),
+        ("price_band", get_price_band(row["price"])),
+        ("availability", get_availability(row["stock"])),
+    ]
+
+
+def facets_ready():
+    return cache.get(FACETS_READY_KEY.format(version=_version())) is not None
+
+
+def adjust_facets(old_rows=(), new_rows=()):
+    """
+    Apply the facet count delta of product changes with atomic cache
+    increments, so concurrent workers never overwrite each other's updates.
+
+    ``old_rows`` are the previous states of changed or deleted products and
+    ``new_rows`` the current states of changed or created products.
+
+    While the counts are not ready a recompute may be running whose query
+    predates this change, so the version is bumped to discard its result.
+    """
+    version = _version()
+    if cache.get(FACETS_READY_KEY.format(version=version)) is None:
+        invalidate_product_facets()
+        return
+    deltas = {}
+    for rows, sign in ((old_rows, -1), (new_rows, 1)):
+        for row in rows:
+            for facet_value in product_facet_values(row):
+                deltas[facet_value] = deltas.get(facet_value, 0) + sign
+    for (facet, value), delta in deltas.items():
+        if not delta:
+            continue
+        key = FACETS_KEY.format(version=version, facet=facet, value=value)
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # The count was evicted; re-creating it from the delta alone would
+            # be served as complete, so have the next read recompute instead.
+            invalidate_product_facets()
+            return
+
+
+def invalidate_product_facets():
+    """
+    Drop all cached facet counts, e.g. after a change whose previous state
+    is unknown.
+    """
+    try:
+        cache.incr(FACETS_VERSION_KEY)
+    except ValueError:
+        cache.add(FACETS_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def serialize_facets(facets, categories):
+    """
+    Shape facet counts for the API response.
+    """
+    status_labels = dict(Product.STATUS_CHOICES)
+    return {
+        "category": [
+            {"value": str(category.uuid), "label": category.name, "count": facets["category"].get(pk, 0)}
+            for pk, category in categories.items()
+        ],
+        "status": [
+            {"value": value, "label": status_labels[value], "count": facets["status"].get(value, 0)}
+            for value in STATUS_VALUES
+        ],
+        "is_active": [
+            {"value": value, "count": facets["is_active"].get(value, 0)} for value in ACTIVE_VALUES
+        ],
+        "price_band": [
+            {"value": value, "count": facets["price_band"].get(value, 0)} for value in PRICE_BAND_VALUES
+        ],
+        "availability": [
+            {"value": value, "count": facets["availability"].get(value, 0)} for value in AVAILABILITY_CHOICES
+        ],
+    }
+
+
+def get_product_facets(queryset=None):
+    """
+    Facet counts for the facets endpoint. Unfiltered counts come from the
+    incrementally maintained cache; filtered counts are computed live.
+    """
+    categories = Category.objects.only("id", "uuid", "name").in_bulk()
+    if queryset is None:
+        facets = get_cached_facets(categories)
+    else:
+        facets = compute_facets(queryset)
+    return serialize_facets(facets, categories)
@@ -0,0 +1,154 @@
+from decimal import Decimal, InvalidOperation
+from uuid import UUID
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+
+from apps.core.models import Product
+
+# (label, lower bound inclusive, upper bound exclusive or None)
+PRICE_BANDS = [
+    ("0-25", Decimal("0"), Decimal("25")),
+    ("25-50", Decimal("25"), Decimal("50")),
+    ("50-100", Decimal("50"), Decimal("100")),
+    ("100-500", Decimal("100"), Decimal("500")),
+    ("500+", Decimal("500"), None),
+]
+
+AVAILABILITY_CHOICES = ["in_stock", "out_of_stock"]
+
+FILTER_PARAMS = (
+    "status", "category", "is_active", "price_band", "min_price", "max_price",
+    "availability", "start_date", "end_date",
+)
+
+
+class InvalidFilter(Exception):
+    """
+    Raised with a client facing message when a filter parameter is malformed.
+    """
+
+
+def get_list_param(params, name):
+    """
+    Read a list parameter that may be repeated or comma separated.
+    """
+    values = []
+    for value in params.getlist(name):
+        values.extend(item.strip() for item in value.split(",") if item.strip())
+    return values
+
+
+def price_band_q(label):
+    for band, lower, upper in PRICE_BANDS:
+        if band == label:
+            q = Q(price__gte=lower)
+            if upper is not None:
+                q &= Q(price__lt=upper)
+            return q
+    raise InvalidFilter(f"Invalid price_band: {label}")
+
+
+def availability_q(value):
+    if value == "in_stock":
+        return Q(stock__gt=0)
+    if value == "out_of_stock":
+        return Q(stock=0)
+    raise InvalidFilter(f"Invalid availability: {value}")
+
+
+def get_price_band(price):
+    price = Decimal(str(price))
+    for band, lower, upper in PRICE_BANDS:
+        if price >= lower and (upper is None or price < upper):
+            return band
+    return None
+
+
+def get_availability(stock):
+    return "in_stock" if stock > 0 else "out_of_stock"
+
+
+def has_filters(params):
+    """
+    Whether ``params`` sets any of the ``filter_products`` parameters; other
+    parameters, such as cache busters, are ignored.
+    """
+    return any(value for param in FILTER_PARAMS for value in params.getlist(param))
+
+
+def filter_products(queryset, params):
+    """
+    Apply the product list filters found in ``params`` (a QueryDict).
+
+    Supported parameters (list values may be repeated or comma separated):
+        status: Product statuses.
+        category: Category UUIDs.
+        is_active: ``true`` or ``false``.
+        price_band: Labels from ``PRICE_BANDS``.
+        min_price / max_price: Inclusive price bounds.
+        availability: ``in_stock`` and/or ``out_of_stock``.
+        start_date / end_date: Inclusive ``YYYY-MM-DD`` bounds on ``created_at``.
+
+    Raises ``InvalidFilter`` for malformed values.
+    """
+    statuses = get_list_param(params, "status")
+    if statuses:
+        invalid = set(statuses) - set(dict(Product.STATUS_CHOICES))
+        if invalid:
+            raise InvalidFilter(f"Invalid status: {', '.join(sorted(invalid))}")
+        queryset = queryset.filter(status__in=statuses)
+
+    categories = get_list_param(params, "category")
+    if categories:
+        try:
+            categories = [UUID(category) for category in categories]
+        except ValueError:
+            raise InvalidFilter("Invalid category UUID")
+        queryset = queryset.filter(category__uuid__in=categories)
+
+    is_active = params.get("is_active")
+    if is_active:
+        if is_active.lower() not in ("true", "false"):
+            raise InvalidFilter("Invalid is_active")
+        queryset = queryset.filter(is_active=is_active.lower() == "true")
+
+    bands = get_list_param(params, "price_band")
+    if bands:
+        q = Q()
+        for band in bands:
+            q |= price_band_q(band)
+        queryset = queryset.filter(q)
+
+    for param, lookup in (("min_price", "price__gte"), ("max_price", "price__lte")):
+        value = params.get(param)
+        if not value:
+            continue
+        try:
+            value = Decimal(value)
+        except InvalidOperation:
+            raise InvalidFilter(f"Invalid {param}")
+        if not value.is_finite():
+            raise InvalidFilter(f"Invalid {param}")
+        queryset = queryset.filter(**{lookup: value})
+
+    availability = get_list_param(params, "availability")
+    if availability:
+        q = Q()
+        for value in availability:
+            q |= availability_q(value)
+        queryset = queryset.filter(q)
+
+    for param, lookup in (("start_date", "created_at__date__gte"), ("end_date", "created_at__date__lte")):
+        value = params.get(param)
+        if not value:
+            continue
+        try:
+            date = parse_date(value)
+        except ValueError:
+            date = None
+        if date is None:
+            raise InvalidFilter(f"Invalid {param}")
+        queryset = queryset.filter(**{lookup: date})
+
+    return queryset
@@ -0,0 +1,106 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.models import Category, Product
+from apps.core.serializers import ProductSerializer, product_values_serializer
+from apps.orders.models import Order, OrderItem
+from apps.orders.serializers import OrderSerializer, serialize_orders
+from apps.users.models import AppUser
+
+
+class Command(BaseCommand):
+    """
+    Compare rows/sec of the DRF serializers against the values() fast path
+    used by the product and order list endpoints.
+
+    Benchmark data is created inside a transaction that is rolled back, so
+    the command can be run against any database.
+    """
+    help = "Benchmark list serialization throughput (DRF vs values() fast path)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=5000)
+        parser.add_argument("--orders", type=int, default=500)
+        parser.add_argument("--items-per-order", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.seed(options["products"], options["orders"], options["items_per_order"])
+            products = Product.objects.filter(created_by=user).order_by("id")
+            orders = Order.objects.filter(user=user).order_by("id")
+            item_count = options["orders"] * options["items_per_order"]
+
+            self.compare(
+                "products",
+                options["products"],
+                lambda: ProductSerializer(products.select_related("category"), many=True).data,
+                lambda: product_values_serializer.serialize(products),
+                options["repeat"],
+            )
+            self.compare(
+                "orders (rows = items)",
+                item_count,
+                lambda: OrderSerializer(orders.prefetch_related("items__product"), many=True).data,
+                lambda: serialize_orders(orders),
+                options["repeat"],
+            )
+            transaction.set_rollback(True)
+
+    def seed(self, product_count, order_count, items_per_order):
+        user = AppUser.objects.create(email=f"benchmark-{uuid.uuid4()}@example.com", first_name="Benchmark")
+        category = Category.objects.create(name=f"benchmark-{uuid.uuid4()}")
+        Product.objects.bulk_create(
+            [
+                Product(
+                    name=f"Product {i}",
+                    description="Benchmark product",
+                    category=category,
+                    price=i % 1000 + 0.99,
+                    stock=i % 50,
+                    created_by=user,
+                )
+                for i in range(product_count)
+            ],
+            batch_size=500,
+        )
+        product_ids = list(Product.objects.filter(created_by=user).values_list("id", flat=True))
+        Order.objects.bulk_create([Order(user=user) for _ in range(order_count)], batch_size=500)
+        order_ids = list(Order.objects.filter(user=user).values_list("id", flat=True))
+        OrderItem.objects.bulk_create(
+            [
+                OrderItem(
+                    order_id=order_id,
+                    product_id=product_ids[(n * items_per_order + i) % len(product_ids)],
+                    quantity=i + 1,
+                    price_at_order=9.99,
+                )
+                for n, order_id in enumerate(order_ids)
+                for i in range(items_per_order)
+            ],
+            batch_size=500,
+        )
+        return user
+
+    def best_time(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def compare(self, label, rows, drf, fast, repeat):
+        renderer = JSONRenderer()
+        identical = renderer.render(drf()) == renderer.render(fast())
+        drf_time = self.best_time(drf, repeat)
+        fast_time = self.best_time(fast, repeat)
+        self.stdout.write(f"{label}: {rows} rows, best of {repeat}, output identical: {identical}")
+        self.stdout.write(f"  DRF serializer   {rows / drf_time:>12,.0f} rows/sec  ({drf_time * 1000:.1f} ms)")
+        self.stdout.write(f"  values() path    {rows / fast_time:>12,.0f} rows/sec  ({fast_time * 1000:.1f} ms)")
+        self.stdout.write(f"  speedup          {drf_time / fast_time:>12.1f}x")
@@ -0,0 +1,79 @@
+from django.db import migrations
+
+# The DDL is inlined as it stood when this migration was written, so the
+# migration does not change with apps.core.search or PRODUCT_SEARCH_BACKEND.
+# Other databases have no index to create and use the index-less backend.
+
+SQLITE_FTS_TABLE = "{table}_fts"
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+        name, description,
+        content='{table}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+        INSERT INTO {fts}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF name, description ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {fts}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS {fts}_ai",
+    "DROP TRIGGER IF EXISTS {fts}_ad",
+    "DROP TRIGGER IF EXISTS {fts}_au",
+    "DROP TABLE IF EXISTS {fts}",
+]
+
+POSTGRES_INSTALL = [
+    "CREATE INDEX IF NOT EXISTS {table}_search_idx ON {table} USING GIN "
+    "(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '')))",
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS {table}_search_idx",
+]
+
+
+def run_statements(apps, schema_editor, statements):
+    table = apps.get_model("core", "Product")._meta.db_table
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement.format(table=table, fts=SQLITE_FTS_TABLE.format(table=table)))
+
+
+def install_search_index(apps, schema_editor):
+    run_statements(apps, schema_editor, {"sqlite": SQLITE_INSTALL, "postgresql": POSTGRES_INSTALL})
+
+
+def uninstall_search_index(apps, schema_editor):
+    run_statements(apps, schema_editor, {"sqlite": SQLITE_UNINSTALL, "postgresql": POSTGRES_UNINSTALL})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_product_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
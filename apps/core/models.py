@@ -40,5 +40,21 @@ class Product(TimeStampModel):
     )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the product list.
+            models.Index(fields=['created_at', 'id'], name='product_created_keyset_idx'),
+            # "My products", newest first.
+            models.Index(fields=['created_by', '-created_at'], name='product_creator_recent_idx'),
+            # Approval queue: pending products, oldest first.
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(status='pending'),
+                name='product_pending_queue_idx',
+            ),
+            # Category browsing filtered by visibility and status.
+            models.Index(fields=['category', 'status', 'is_active'], name='product_category_browse_idx'),
+        ]
+
     def __str__(self):
         return self.name
\ No newline at end of file
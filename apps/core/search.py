@@ -0,0 +1,197 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from apps.core.models import Product
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(query):
+    """
+    Split a user query into plain word tokens; anything else is dropped so the
+    tokens can be embedded safely in backend specific query syntax.
+    """
+    return TOKEN_RE.findall(query.lower())
+
+
+class BaseSearchBackend(object):
+    """
+    Product search backend interface.
+
+    ``install`` creates whatever index structures the backend needs and must be
+    idempotent; ``search`` returns product ids ordered by relevance.
+    """
+
+    def install(self, schema_editor):
+        pass
+
+    def rebuild(self, schema_editor):
+        pass
+
+    def uninstall(self, schema_editor):
+        pass
+
+    def ensure_installed(self, schema_editor):
+        """
+        Re-create missing index structures, rebuilding the index when it may
+        have missed changes while they were gone.
+        """
+        self.install(schema_editor)
+
+    def search(self, query, limit):
+        raise NotImplementedError
+
+
+class SqliteFTS5SearchBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 inverted index over ``Product.name`` and ``description``.
+
+    The FTS table is an external content table over ``core_product`` kept in
+    sync by triggers, and results are ranked with bm25 weighting name matches
+    above description matches. Every token is matched as a prefix.
+    """
+    table = "core_product_fts"
+    name_weight = 10.0
+    description_weight = 1.0
+
+    def install(self, schema_editor):
+        table = self.table
+        statements = [
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+                name, description,
+                content='core_product', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON core_product BEGIN
+                INSERT INTO {table}(rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON core_product BEGIN
+                INSERT INTO {table}({table}, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF name, description ON core_product BEGIN
+                INSERT INTO {table}({table}, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+                INSERT INTO {table}(rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+            """,
+        ]
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    def rebuild(self, schema_editor):
+        schema_editor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+    def ensure_installed(self, schema_editor):
+        names = [self.table] + [f"{self.table}_{trigger}" for trigger in ("ai", "ad", "au")]
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE name IN (%s, %s, %s, %s)", names
+            )
+            if cursor.fetchone()[0] == len(names):
+                return
+        # Writes made while the triggers were missing never reached the index.
+        self.install(schema_editor)
+        self.rebuild(schema_editor)
+
+    def uninstall(self, schema_editor):
+        for trigger in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {self.table}_{trigger}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def search(self, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = " ".join(f'"{token}"*' for token in tokens)
+        sql = (
+            f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s "
+            f"ORDER BY bm25({self.table}, %s, %s) LIMIT %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [match, self.name_weight, self.description_weight, limit])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    PostgreSQL full text search backed by a GIN expression index.
+    """
+    index = "core_product_search_idx"
+    document = "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))"
+
+    def install(self, schema_editor):
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.index} ON core_product USING GIN ({self.document})"
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {self.index}")
+
+    def search(self, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        tsquery = " & ".join(f"{token}:*" for token in tokens)
+        sql = (
+            f"SELECT id FROM core_product "
+            f"WHERE {self.document} @@ to_tsquery('simple', %s) "
+            f"ORDER BY ts_rank({self.document}, to_tsquery('simple', %s)) DESC, id LIMIT %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [tsquery, tsquery, limit])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """
+    Index-less fallback for databases without a native full text engine.
+    """
+
+    def search(self, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        products = Product.objects.all()
+        for token in tokens:
+            products = products.filter(Q(name__icontains=token) | Q(description__icontains=token))
+        return list(products.order_by("-created_at").values_list("id", flat=True)[:limit])
+
+
+SEARCH_BACKENDS = {
+    "sqlite": SqliteFTS5SearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_search_backend(vendor=None):
+    """
+    Return the configured ``PRODUCT_SEARCH_BACKEND`` or the native backend for
+    the database vendor.
+    """
+    backend_path = getattr(settings, "PRODUCT_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+    return SEARCH_BACKENDS.get(vendor or connection.vendor, SimpleSearchBackend)()
+
+
+def search_products(query, limit):
+    """
+    Return products matching ``query`` ordered by relevance.
+    """
+    ids = get_search_backend().search(query, limit)
+    products = Product.objects.in_bulk(ids)
+    return [products[pk] for pk in ids if pk in products]
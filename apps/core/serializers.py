@@ -1,5 +1,8 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 from apps.core.models import Category, Product
+from utils.serializers import ValuesSerializer
 
 class CategorySerializer(serializers.ModelSerializer):
     """
@@ -18,3 +21,62 @@ class ProductSerializer(serializers.ModelSerializer):
         model = Product
         fields = ['uuid', 'name', 'description', 'category', 'price', 'stock', 'is_active', 'status', 'created_by', 'created_at', 'updated_at']
         read_only_fields = ['created_by']
+
+
+# Read-only fast path for product list endpoints, same output as ProductSerializer.
+product_values_serializer = ValuesSerializer(ProductSerializer)
+
+
+class ProductBulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer that validates every row independently.
+
+    Invalid rows are collected in ``row_errors`` (keyed by their index in the
+    payload) instead of failing the whole batch, and ``valid_indexes`` records
+    the payload index of each entry in ``validated_data``.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError({"non_field_errors": ["Expected a list of items."]})
+        if self.max_length is not None and len(data) > self.max_length:
+            raise serializers.ValidationError(
+                {"non_field_errors": [f"Ensure this field has no more than {self.max_length} elements."]}
+            )
+
+        validated, self.valid_indexes, self.row_errors = [], [], {}
+        for index, item in enumerate(data):
+            try:
+                validated.append(self.child.run_validation(item))
+                self.valid_indexes.append(index)
+            except serializers.ValidationError as exc:
+                self.row_errors[index] = exc.detail
+        return validated
+
+    def create(self, validated_data):
+        batch_size = getattr(settings, "BULK_CREATE_BATCH_SIZE", 500)
+        products = [Product(**attrs) for attrs in validated_data]
+        with transaction.atomic():
+            Product.objects.bulk_create(products, batch_size=batch_size)
+        return products
+
+
+class ProductBulkCreateSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a single row of a bulk product import.
+
+    ``category`` is a category UUID resolved against the ``categories`` map
+    passed in the serializer context, so a whole batch costs one lookup query.
+    """
+    category = serializers.UUIDField()
+
+    class Meta:
+        model = Product
+        fields = ['name', 'description', 'category', 'price', 'stock', 'is_active']
+        list_serializer_class = ProductBulkListSerializer
+
+    def validate_category(self, value):
+        category = self.context.get("categories", {}).get(value)
+        if category is None:
+            raise serializers.ValidationError("Invalid category UUID")
+        return category
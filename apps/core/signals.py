@@ -0,0 +1,72 @@
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.core.cache import invalidate_category_list
+from apps.core.facets import (
+    FACET_FIELDS,
+    adjust_facets,
+    facets_ready,
+    invalidate_product_facets,
+    product_facet_row,
+)
+from apps.core.models import Category, Product
+from apps.core.search import get_search_backend
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    """
+    Invalidate the cached category list once the change is committed, so no
+    reader can re-cache the old rows under the new version.
+    """
+    transaction.on_commit(invalidate_category_list)
+
+
+@receiver(pre_save, sender=Product)
+def snapshot_product_facets(sender, instance, raw=False, **kwargs):
+    """
+    Remember the stored facet values of an updated product so post_save can
+    apply the delta. Skipped while the facet cache is cold.
+    """
+    instance._facet_row = None
+    if instance.pk and not raw and facets_ready():
+        instance._facet_row = Product.objects.filter(pk=instance.pk).values(*FACET_FIELDS).first()
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_row = getattr(instance, "_facet_row", None)
+    if not created and old_row is None:
+        transaction.on_commit(invalidate_product_facets)
+        return
+    old_rows = [] if created else [old_row]
+    new_rows = [product_facet_row(instance)]
+    transaction.on_commit(lambda: adjust_facets(old_rows, new_rows))
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    old_rows = [product_facet_row(instance)]
+    transaction.on_commit(lambda: adjust_facets(old_rows=old_rows))
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, using, **kwargs):
+    """
+    Re-create the product search index structures after migrations.
+
+    SQLite rebuilds ``core_product`` for many schema changes, which silently
+    drops the triggers that keep the full text index in sync; the index is
+    rebuilt when they had to be re-created.
+    """
+    if sender.label != "core":
+        return
+    connection = connections[using]
+    if Product._meta.db_table not in connection.introspection.table_names():
+        return
+    with connection.schema_editor() as schema_editor:
+        get_search_backend(connection.vendor).ensure_installed(schema_editor)
@@ -1,3 +1,641 @@
-from django.test import TestCase
+import csv
+import io
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.core import facets
+from apps.core.cache import get_category_list_version
+from apps.core.filters import InvalidFilter, filter_products
+from apps.core.models import Category, Product
+from apps.core.search import SqliteFTS5SearchBackend, search_products
+from apps.core.serializers import ProductSerializer, product_values_serializer
+from apps.users.models import AppUser
+from utils.pagination import InvalidCursor, KeysetPaginator
+
+
+class ProductIndexQueryPlanTests(TestCase):
+    """
+    Assert that the hot product queries are planned against their composite
+    and partial indexes instead of table scans plus sorts.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AppUser.objects.create_user(email="owner@example.com", password="Passw0rd!", first_name="Owner")
+        cls.category = Category.objects.create(name="Books")
+        Product.objects.bulk_create([
+            Product(
+                name=f"Product {i}",
+                category=cls.category,
+                price=10,
+                created_by=cls.user,
+                status=["pending", "approved", "rejected"][i % 3],
+            )
+            for i in range(30)
+        ])
+
+    def setUp(self):
+        if connection.vendor == "postgresql":
+            # Tiny test tables would otherwise always be sequentially scanned.
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg=f"{index_name} not used:\n{plan}")
+
+    def test_my_products_uses_creator_index(self):
+        queryset = Product.objects.filter(created_by=self.user).order_by("-created_at")
+        self.assertUsesIndex(queryset, "product_creator_recent_idx")
+
+    def test_approval_queue_uses_partial_index(self):
+        queryset = Product.objects.filter(status="pending").order_by("created_at")
+        self.assertUsesIndex(queryset, "product_pending_queue_idx")
+
+    def test_category_browsing_uses_browse_index(self):
+        queryset = Product.objects.filter(category=self.category, is_active=True, status="approved")
+        self.assertUsesIndex(queryset, "product_category_browse_idx")
+
+    def test_product_list_page_uses_keyset_index(self):
+        queryset = Product.objects.order_by("created_at", "id")[:50]
+        self.assertUsesIndex(queryset, "product_created_keyset_idx")
+
+
+class ProductValuesSerializerTests(TestCase):
+    """
+    The values() fast path must render exactly what ProductSerializer renders.
+    """
+
+    def test_output_matches_product_serializer(self):
+        user = AppUser.objects.create_user(email="owner@example.com", password="Passw0rd!", first_name="Owner")
+        category = Category.objects.create(name="Books")
+        for i, price in enumerate(["0.5", "10", "99999999.99"]):
+            Product.objects.create(
+                name=f'Product "{i}" \u00e9',
+                category=category,
+                price=price,
+                stock=i,
+                is_active=bool(i % 2),
+                created_by=user,
+            )
+        products = Product.objects.order_by("id")
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(product_values_serializer.serialize(products)),
+            renderer.render(ProductSerializer(products, many=True).data),
+        )
+
+
+class ProductListPaginationTests(TestCase):
+    """
+    Keyset pages must visit every product exactly once, even across ties.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AppUser.objects.create_user(email="owner@example.com", password="Passw0rd!", first_name="Owner")
+        category = Category.objects.create(name="Books")
+        cls.products = Product.objects.bulk_create([
+            Product(name=f"Product {i}", category=category, price=10, created_by=cls.user) for i in range(5)
+        ])
+        # Products 1-3 share one created_at, so only the id breaks the tie.
+        now = timezone.now()
+        Product.objects.filter(pk=cls.products[0].pk).update(created_at=now - timedelta(minutes=1))
+        Product.objects.filter(pk__in=[product.pk for product in cls.products[1:4]]).update(created_at=now)
+        Product.objects.filter(pk=cls.products[4].pk).update(created_at=now + timedelta(minutes=1))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_pages_walk_ties_in_order(self):
+        seen = []
+        url = "/core/products/?page_size=2"
+        while url:
+            body = self.client.get(url).json()
+            self.assertLessEqual(len(body["data"]), 2)
+            seen.extend(product["uuid"] for product in body["data"])
+            cursor = body["pagination"]["next"]
+            url = f"/core/products/?page_size=2&cursor={cursor}" if cursor else None
+
+        self.assertEqual(seen, [str(product.uuid) for product in self.products])
+
+    def test_cursor_round_trip(self):
+        created_at = timezone.now()
+        cursor = KeysetPaginator.encode_cursor(created_at, 42)
+
+        self.assertNotIn("=", cursor)
+        self.assertEqual(KeysetPaginator.decode_cursor(cursor), (created_at, 42))
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ("not-a-cursor", KeysetPaginator.encode_cursor(timezone.now(), 1)[:-3]):
+            with self.assertRaises(InvalidCursor):
+                KeysetPaginator.decode_cursor(cursor)
+
+        response = self.client.get("/core/products/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], "Invalid cursor")
+
+
+class ProductSearchTests(TestCase):
+    """
+    Search must rank name matches first and follow product writes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AppUser.objects.create_user(email="owner@example.com", password="Passw0rd!", first_name="Owner")
+        cls.category = Category.objects.create(name="Books")
+
+    def create_product(self, name, description=""):
+        return Product.objects.create(
+            name=name, description=description, category=self.category, price=10, created_by=self.user
+        )
+
+    def test_name_matches_rank_above_description_matches(self):
+        described = self.create_product("Field guide", "Covers every lantern ever made")
+        named = self.create_product("Lantern", "A light")
+
+        self.assertEqual(search_products("lantern", 10), [named, described])
+
+    def test_index_follows_insert_update_and_delete(self):
+        product = self.create_product("Lantern")
+        self.assertEqual(search_products("lant", 10), [product])
+
+        product.name = "Compass"
+        product.save()
+        self.assertEqual(search_products("lantern", 10), [])
+        self.assertEqual(search_products("compass", 10), [product])
+
+        product.delete()
+        self.assertEqual(search_products("compass", 10), [])
+
+    def test_search_endpoint_applies_list_filters(self):
+        approved = self.create_product("Lantern")
+        Product.objects.filter(pk=approved.pk).update(status="approved")
+        self.create_product("Lantern stand")
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get("/core/products/search/?q=lantern&status=approved")
+        self.assertEqual([row["uuid"] for row in response.json()["data"]], [str(approved.uuid)])
+
+        response = client.get("/core/products/search/?q=lantern&status=bogus")
+        self.assertEqual(response.status_code, 400)
+
+
+class ProductSearchIndexRepairTests(TransactionTestCase):
+    """
+    Re-installing dropped search triggers must rebuild the index. SQLite's
+    schema editor cannot run inside the TestCase transaction.
+    """
+
+    def test_missing_triggers_are_reinstalled_and_index_rebuilt(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite FTS5 triggers only")
+        backend = SqliteFTS5SearchBackend()
+        user = AppUser.objects.create_user(email="owner@example.com", password="Passw0rd!", first_name="Owner")
+        category = Category.objects.create(name="Books")
+        with connection.cursor() as cursor:
+            for trigger in ("ai", "ad", "au"):
+                cursor.execute(f"DROP TRIGGER {backend.table}_{trigger}")
+        # Written while the index is not kept in sync.
+        product = Product.objects.create(name="Lantern", category=category, price=10, created_by=user)
+        self.assertEqual(search_products("lantern", 10), [])
+
+        with connection.schema_editor() as schema_editor:
+            backend.ensure_installed(schema_editor)
+
+        self.assertEqual(search_products("lantern", 10), [product])
+        product.delete()
+        self.assertEqual(search_products("lantern", 10), [])
+
+
+class ProductFilterTests(TestCase):
+    """
+    filter_products must apply each documented parameter and reject bad values.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = AppUser.objects.create_user(email="owner@example.com", password="Passw0rd!", first_name="Owner")
+        cls.books = Category.objects.create(name="Books")
+        games = Category.objects.create(name="Games")
+        cls.cheap = Product.objects.create(
+            name="Cheap", category=cls.books, price=10, stock=0, created_by=user, status="approved"
+        )
+        cls.mid = Product.objects.create(
+            name="Mid", category=games, price=Decimal("50"), stock=3, created_by=user, is_active=False
+        )
+        cls.dear = Product.objects.create(
+            name="Dear", category=cls.books, price=600, stock=1, created_by=user, status="rejected"
+        )
+
+    def filtered(self, query):
+        return set(filter_products(Product.objects.all(), QueryDict(query)))
+
+    def test_filters(self):
+        self.assertEqual(self.filtered("status=approved,rejected"), {self.cheap, self.dear})
+        self.assertEqual(self.filtered(f"category={self.books.uuid}"), {self.cheap, self.dear})
+        self.assertEqual(self.filtered("is_active=false"), {self.mid})
+        self.assertEqual(self.filtered("price_band=0-25&price_band=500%2B"), {self.cheap, self.dear})
+        self.assertEqual(self.filtered("min_price=50&max_price=600"), {self.mid, self.dear})
+        self.assertEqual(self.filtered("availability=out_of_stock"), {self.cheap})
+        self.assertEqual(self.filtered("availability=in_stock&status=pending"), {self.mid})
+        self.assertEqual(self.filtered(""), {self.cheap, self.mid, self.dear})
+
+    def test_invalid_values_are_rejected(self):
+        for query in (
+            "status=lost", "category=nope", "is_active=maybe", "price_band=1-2",
+            "min_price=abc", "max_price=NaN", "availability=soon", "start_date=2024-13-01",
+        ):
+            with self.subTest(query=query), self.assertRaises(InvalidFilter):
+                filter_products(Product.objects.all(), QueryDict(query))
+
+
+class ProductFacetsTests(TestCase):
+    """
+    Cached facet counts must follow product writes without a recompute.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AppUser.objects.create_user(email="owner@example.com", password="Passw0rd!", first_name="Owner")
+        cls.category = Category.objects.create(name="Books")
+        Product.objects.create(name="Book", category=cls.category, price=10, stock=2, created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_facets(self, query=""):
+        response = self.client.get(f"/core/products/facets/{query}")
+        self.assertEqual(response.status_code, 200)
+        return {
+            facet: {str(entry["value"]): entry["count"] for entry in entries}
+            for facet, entries in response.json()["data"].items()
+        }
+
+    def create_product(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Product.objects.create(name="New", category=self.category, created_by=self.user, **kwargs)
+
+    def test_writes_adjust_cached_counts(self):
+        self.get_facets()
+        with mock.patch("apps.core.facets.compute_facets", side_effect=AssertionError("recomputed")):
+            product = self.create_product(price=30, stock=0)
+            counts = self.get_facets()
+            self.assertEqual(counts["category"][str(self.category.uuid)], 2)
+            self.assertEqual(counts["price_band"], {"0-25": 1, "25-50": 1, "50-100": 0, "100-500": 0, "500+": 0})
+            self.assertEqual(counts["availability"], {"in_stock": 1, "out_of_stock": 1})
+
+            product.status = "approved"
+            product.price = 700
+            with self.captureOnCommitCallbacks(execute=True):
+                product.save()
+            counts = self.get_facets()
+            self.assertEqual(counts["status"], {"pending": 1, "approved": 1, "rejected": 0, "cancelled": 0})
+            self.assertEqual(counts["price_band"]["25-50"], 0)
+            self.assertEqual(counts["price_band"]["500+"], 1)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                product.delete()
+            counts = self.get_facets()
+            self.assertEqual(counts["category"][str(self.category.uuid)], 1)
+            self.assertEqual(counts["status"]["approved"], 0)
+            self.assertEqual(counts["availability"], {"in_stock": 1, "out_of_stock": 0})
+
+    def test_write_during_recompute_is_not_lost(self):
+        compute_facets = facets.compute_facets
+
+        def compute_then_write(queryset):
+            result = compute_facets(queryset)
+            # Committed after the recompute read the products.
+            self.create_product(price=10, stock=1)
+            return result
+
+        with mock.patch("apps.core.facets.compute_facets", side_effect=compute_then_write):
+            self.get_facets()
+        self.assertEqual(self.get_facets()["category"][str(self.category.uuid)], 2)
+
+    def test_delta_on_evicted_count_forces_a_recompute(self):
+        self.get_facets()
+        cache.delete(facets.FACETS_KEY.format(version=facets._version(), facet="availability", value="in_stock"))
+
+        self.create_product(price=10, stock=5)
+
+        self.assertEqual(self.get_facets()["availability"]["in_stock"], 2)
+
+    def test_unknown_parameters_are_served_from_cache(self):
+        self.get_facets()
+        with mock.patch("apps.core.facets.compute_facets", side_effect=AssertionError("computed live")):
+            self.assertEqual(self.get_facets("?_=12345")["availability"]["in_stock"], 1)
+
+    def test_filtered_counts(self):
+        self.create_product(price=30, stock=0)
+        counts = self.get_facets("?availability=out_of_stock")
+        self.assertEqual(counts["category"][str(self.category.uuid)], 1)
+        self.assertEqual(counts["price_band"]["25-50"], 1)
+        self.assertEqual(counts["price_band"]["0-25"], 0)
+
+
+class ProductExportTests(TestCase):
+    """
+    The export endpoint must stream well formed CSV with one row per product.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = AppUser.objects.create_user(
+            email="admin@example.com", password="Passw0rd!", first_name="Admin", role="admin"
+        )
+        category = Category.objects.create(name="Books, used")
+        cls.products = [
+            Product.objects.create(
+                name=name, category=category, price=10, created_by=cls.admin, status="approved"
+            )
+            for name in ('Plain', 'Says "hi", twice', "Line\nbreak")
+        ]
+        Product.objects.create(name="Pending", category=category, price=10, created_by=cls.admin)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, query):
+        response = self.client.get(f"/core/products/export/{query}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(content, newline="")))
+
+    def test_streams_header_escaped_rows_and_every_product(self):
+        rows = self.export("?columns=uuid,name,category&status=approved")
+
+        self.assertEqual(rows[0], ["uuid", "name", "category"])
+        self.assertEqual(len(rows), 1 + len(self.products))
+        self.assertEqual(
+            rows[1:],
+            [[str(product.uuid), product.name, "Books, used"] for product in self.products],
+        )
+
+    def test_default_columns(self):
+        rows = self.export("")
+
+        self.assertEqual(rows[0], ["uuid", "name", "category", "price", "stock", "status", "created_at"])
+        self.assertEqual(len(rows), 5)
+
+    def test_invalid_columns_are_rejected(self):
+        response = self.client.get("/core/products/export/?columns=name,password")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["data"], ["password"])
+
+
+class ProductBulkCreateTests(TestCase):
+    """
+    Bulk creation inserts the valid rows and reports the others by index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = AppUser.objects.create_user(
+            email="admin@example.com", password="Passw0rd!", first_name="Admin", role="admin"
+        )
+        cls.category = Category.objects.create(name="Books")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def row(self, name, **kwargs):
+        return {"name": name, "category": str(self.category.uuid), "price": "10.00", "stock": 1, **kwargs}
+
+    def test_partial_success(self):
+        rows = [
+            self.row("First"),
+            self.row("Bad price", price="free"),
+            self.row("Second"),
+            self.row("Bad category", category="00000000-0000-0000-0000-000000000000"),
+        ]
+        response = self.client.post("/core/products/bulk/", {"products": rows, "status": "approved"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual([row["index"] for row in data["created"]], [0, 2])
+        self.assertEqual([row["index"] for row in data["errors"]], [1, 3])
+        self.assertIn("price", data["errors"][0]["errors"])
+        self.assertIn("category", data["errors"][1]["errors"])
+        self.assertEqual(
+            sorted(Product.objects.values_list("name", "status")), [("First", "approved"), ("Second", "approved")]
+        )
+        self.assertEqual(
+            {str(uuid) for uuid in Product.objects.values_list("uuid", flat=True)},
+            {row["uuid"] for row in data["created"]},
+        )
+
+    def test_no_valid_rows(self):
+        response = self.client.post("/core/products/bulk/", {"products": [self.row("", price="-")]}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([row["index"] for row in response.json()["data"]["errors"]], [0])
+        self.assertFalse(Product.objects.exists())
+
+    @override_settings(BULK_PRODUCT_MAX_ROWS=2)
+    def test_batch_limit(self):
+        rows = [self.row(f"Product {i}") for i in range(3)]
+        response = self.client.post("/core/products/bulk/", {"products": rows}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], "A batch may contain at most 2 products")
+        self.assertFalse(Product.objects.exists())
+
+
+class ProductBulkApprovalTests(TestCase):
+    """
+    Bulk approval changes only pending products and reports the rest.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = AppUser.objects.create_user(
+            email="admin@example.com", password="Passw0rd!", first_name="Admin", role="admin"
+        )
+        cls.buyer = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        category = Category.objects.create(name="Books")
+        cls.pending = [
+            Product.objects.create(name=f"Pending {i}", category=category, price=10, created_by=cls.admin)
+            for i in range(2)
+        ]
+        cls.rejected = Product.objects.create(
+            name="Rejected", category=category, price=10, created_by=cls.admin, status="rejected"
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def post(self, uuids, action="approve"):
+        return self.client.post("/core/products/status/bulk/", {"uuids": uuids, "action": action}, format="json")
+
+    def test_changes_pending_and_reports_the_rest(self):
+        missing = "00000000-0000-0000-0000-000000000000"
+        response = self.post([str(product.uuid) for product in self.pending] + [str(self.rejected.uuid), missing])
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(sorted(data["changed"]), sorted(str(product.uuid) for product in self.pending))
+        self.assertEqual(data["skipped"], [str(self.rejected.uuid)])
+        self.assertEqual(data["not_found"], [missing])
+        self.assertEqual(
+            sorted(Product.objects.values_list("name", "status")),
+            [("Pending 0", "approved"), ("Pending 1", "approved"), ("Rejected", "rejected")],
+        )
+
+    def test_concurrently_approved_product_is_reported_as_skipped(self):
+        raced = self.pending[0]
+        real_now = timezone.now
+
+        def approve_concurrently():
+            # Another request approves the product just before this UPDATE runs.
+            Product.objects.filter(pk=raced.pk).update(status="approved", updated_at=real_now())
+            return real_now()
+
+        with mock.patch("apps.core.views.timezone.now", side_effect=approve_concurrently):
+            response = self.post([str(product.uuid) for product in self.pending])
+
+        data = response.json()["data"]
+        self.assertEqual(data["changed"], [str(self.pending[1].uuid)])
+        self.assertEqual(data["skipped"], [str(raced.uuid)])
+        self.assertEqual(response.json()["message"], "1 products approved")
+
+    def test_invalid_requests(self):
+        uuid = str(self.pending[0].uuid)
+        for uuids, action, message in (
+            ([uuid], "publish", "Invalid action"),
+            ([], "approve", "uuids must be a non-empty list"),
+            (["not-a-uuid"], "reject", "Invalid product UUID"),
+        ):
+            with self.subTest(message=message):
+                response = self.post(uuids, action)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["message"], message)
+        with override_settings(BULK_APPROVAL_MAX_ITEMS=1):
+            response = self.post([str(product.uuid) for product in self.pending])
+        self.assertEqual(response.json()["message"], "At most 1 products can be updated at once")
+        self.assertFalse(Product.objects.exclude(status="pending").exclude(pk=self.rejected.pk).exists())
+
+    def test_requires_admin_or_staff(self):
+        self.client.force_authenticate(self.buyer)
+
+        self.assertEqual(self.post([str(self.pending[0].uuid)]).status_code, 403)
+
+
+class CategoryListCacheTests(TestCase):
+    """
+    Every category write must bump the list version so the next read is fresh.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = AppUser.objects.create_user(
+            email="admin@example.com", password="Passw0rd!", first_name="Admin", role="admin"
+        )
+        Category.objects.create(name="Books")
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def names(self):
+        response = self.client.get("/core/categories/")
+        self.assertEqual(response.status_code, 200)
+        return sorted(category["name"] for category in response.json()["data"])
+
+    def assertBumpsVersion(self, method, url, data=None):
+        self.assertEqual(self.names(), self.names())
+        version = get_category_list_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.client, method)(url, data, format="json")
+        self.assertLess(response.status_code, 300)
+        self.assertGreater(get_category_list_version(), version)
+        return response
+
+    def test_create_update_and_delete_refresh_the_list(self):
+        response = self.assertBumpsVersion("post", "/core/categories/", {"name": "Games"})
+        self.assertEqual(self.names(), ["Books", "Games"])
+
+        url = f"/core/categories/{response.json()['data']['uuid']}/"
+        self.assertBumpsVersion("patch", url, {"name": "Puzzles"})
+        self.assertEqual(self.names(), ["Books", "Puzzles"])
+
+        self.assertBumpsVersion("delete", url)
+        self.assertEqual(self.names(), ["Books"])
+
+    def test_reads_are_served_from_cache(self):
+        self.names()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names(), ["Books"])
+
+
+class ProductPreconditionTests(TestCase):
+    """
+    Product detail must send an ETag and honour If-None-Match and If-Match.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AppUser.objects.create_user(email="owner@example.com", password="Passw0rd!", first_name="Owner")
+        category = Category.objects.create(name="Books")
+        cls.product = Product.objects.create(name="Novel", category=category, price=10, created_by=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/core/products/{self.product.uuid}/"
+
+    def test_get_sends_etag_and_answers_if_none_match(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"other", {etag}')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_if_match_rejects_stale_writes(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.patch(self.url, {"name": "Atlas"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        new_etag = response["ETag"]
+        self.assertNotEqual(new_etag, etag)
+
+        for method, data in (("patch", {"name": "Stale"}), ("delete", None)):
+            with self.subTest(method=method):
+                response = getattr(self.client, method)(self.url, data, format="json", HTTP_IF_MATCH=etag)
+                self.assertEqual(response.status_code, 412)
+                self.assertEqual(response["ETag"], new_etag)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.name, "Atlas")
+
+        response = self.client.delete(self.url, HTTP_IF_MATCH=new_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Product.objects.exists())
@@ -4,7 +4,12 @@ from apps.core.views import (
     CategoryRetrieveUpdateDestroyAPIView,
     ProductListCreateAPIView,
     ProductRetrieveUpdateDestroyAPIView,
+    ProductExportView,
+    ProductBulkCreateView,
+    ProductSearchView,
+    ProductFacetsView,
     ProductApprovalView,
+    ProductBulkApprovalView,
     MyProductsView,
     dashboard_view)
 from apps.core import views
@@ -13,6 +18,11 @@ urlpatterns = [
     path('categories/', CategoryListCreateAPIView.as_view(), name='category-list-create'),
     path('categories/<uuid>/', CategoryRetrieveUpdateDestroyAPIView.as_view(), name='category-detail'),
     path('products/', ProductListCreateAPIView.as_view(), name='product-list-create'),
+    path('products/bulk/', ProductBulkCreateView.as_view(), name='product-bulk-create'),
+    path('products/search/', ProductSearchView.as_view(), name='product-search'),
+    path('products/facets/', ProductFacetsView.as_view(), name='product-facets'),
+    path('products/status/bulk/', ProductBulkApprovalView.as_view(), name='product-status-bulk'),
+    path('products/export/', ProductExportView.as_view(), name='product-export'),
     path('products/<uuid>/', ProductRetrieveUpdateDestroyAPIView.as_view(), name='product-detail'),
     path('products/<uuid:uuid>/status/', ProductApprovalView.as_view(), name='product-status'),
     path("my-products/", MyProductsView.as_view(), name="my-products"),
@@ -1,12 +1,32 @@
+from uuid import UUID
 from rest_framework.views import APIView
 from django.shortcuts import render
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from apps.core.models import Category, Product
-from apps.core.serializers import CategorySerializer, ProductSerializer
+from apps.core.serializers import (
+    CategorySerializer,
+    ProductSerializer,
+    ProductBulkCreateSerializer,
+    product_values_serializer,
+)
 from rest_framework.permissions import IsAuthenticated
 from apps.core.tasks import process_product_video
 from utils.mixins import ResponseViewMixin
 from utils.permissions import IsAdmin, IsStaff, IsAgent, IsAdminOrStaff
 from utils.decorators import log_execution_time
+from utils.pagination import KeysetPaginator, InvalidCursor
+from apps.core.cache import (
+    get_cached_category_list,
+    get_category_list_version,
+    set_cached_category_list,
+)
+from apps.core.search import search_products
+from apps.core.filters import InvalidFilter, filter_products, get_list_param, has_filters
+from apps.core.facets import FACET_FIELDS, adjust_facets, get_product_facets, product_facet_row
+from apps.core.exports import EXPORT_COLUMNS, DEFAULT_EXPORT_COLUMNS, EXPORT_FORMATS
 
 class CategoryListCreateAPIView(APIView, ResponseViewMixin):
     """
@@ -15,7 +35,9 @@ class CategoryListCreateAPIView(APIView, ResponseViewMixin):
     Methods:
         get(request):
             Retrieve a list of all categories.
-            Returns a success response with serialized category data.
+            Returns a success response with serialized category data. The
+            rendered response is cached and invalidated whenever a category
+            is saved or deleted (see ``apps.core.signals``).
 
         post(request):
             Create a new category with the provided data.
@@ -25,9 +47,14 @@ class CategoryListCreateAPIView(APIView, ResponseViewMixin):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        categories = Category.objects.all()
-        serializer = CategorySerializer(categories, many=True)
-        return self.success_response(data=serializer.data, message="Fetched Successfully")
+        content = get_cached_category_list()
+        if content is None:
+            version = get_category_list_version()
+            categories = Category.objects.all()
+            serializer = CategorySerializer(categories, many=True)
+            content = self.render_envelope(data=serializer.data, message="Fetched Successfully")
+            set_cached_category_list(content, version)
+        return self.rendered_response(content)
 
     @log_execution_time
     def post(self, request):
@@ -49,31 +76,45 @@ class CategoryRetrieveUpdateDestroyAPIView(APIView, ResponseViewMixin):
     """
     permission_classes = [IsAuthenticated, IsAdmin]
 
-    def get_object(self, uuid):
-        return Category.objects.filter(uuid=uuid).first()
+    def get_object(self, uuid, lock=False):
+        queryset = Category.objects.select_for_update() if lock else Category.objects.all()
+        return queryset.filter(uuid=uuid).first()
 
     def get(self, request, uuid):
         category = self.get_object(uuid)
         if not category:
             return self.error_response(message="Category not found")
+        not_modified = self.evaluate_preconditions(request, category)
+        if not_modified:
+            return not_modified
         serializer = CategorySerializer(category)
-        return self.success_response(data=serializer.data, message="Category details fetched")
+        response = self.success_response(data=serializer.data, message="Category details fetched")
+        return self.set_etag(response, category)
 
     def patch(self, request, uuid):
-        category = self.get_object(uuid)
-        if not category:
-            return self.error_response(message="Category not found")
-        serializer = CategorySerializer(category, data=request.data, partial=True)
-        if serializer.is_valid():
+        with transaction.atomic():
+            category = self.get_object(uuid, lock=True)
+            if not category:
+                return self.error_response(message="Category not found")
+            precondition_failed = self.evaluate_preconditions(request, category)
+            if precondition_failed:
+                return precondition_failed
+            serializer = CategorySerializer(category, data=request.data, partial=True)
+            if not serializer.is_valid():
+                return self.error_response(message="Update failed", data=serializer.errors)
             serializer.save()
-            return self.success_response(data=serializer.data, message="Category updated")
-        return self.error_response(message="Update failed", data=serializer.errors)
+        response = self.success_response(data=serializer.data, message="Category updated")
+        return self.set_etag(response, category)
 
     def delete(self, request, uuid):
-        category = self.get_object(uuid)
-        if not category:
-            return self.error_response(message="Category not found")
-        category.delete()
+        with transaction.atomic():
+            category = self.get_object(uuid, lock=True)
+            if not category:
+                return self.error_response(message="Category not found")
+            precondition_failed = self.evaluate_preconditions(request, category)
+            if precondition_failed:
+                return precondition_failed
+            category.delete()
         return self.success_response(message="Category deleted")
 
 
@@ -83,15 +124,27 @@ class ProductListCreateAPIView(APIView, ResponseViewMixin):
     API view to handle listing and creation of products.
 
     This view provides two main functionalities:
-    1. GET: Retrieve a list of all products along with their associated categories.
+    1. GET: Retrieve a page of products along with their associated categories.
+       Pages are keyset paginated on (created_at, id); pass the ``next`` cursor
+       from the response envelope as ``?cursor=`` to fetch the following page.
+       Accepts the filters documented in ``apps.core.filters.filter_products``.
     2. POST: Create a new product with the provided data.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        products = Product.objects.select_related('category').all()
-        serializer = ProductSerializer(products, many=True)
-        return self.success_response(data=serializer.data)
+        paginator = KeysetPaginator()
+        try:
+            products = filter_products(Product.objects.all(), request.query_params)
+            rows, pagination = paginator.paginate(
+                products.values("id", *product_values_serializer.lookups), request
+            )
+        except InvalidFilter as exc:
+            return self.error_response(message=str(exc))
+        except InvalidCursor:
+            return self.error_response(message="Invalid cursor")
+        data = product_values_serializer.serialize_rows(rows)
+        return self.paginated_response(data=data, pagination=pagination)
 
     def post(self, request):
         category_uuid = request.data.get("category")
@@ -110,6 +163,161 @@ class ProductListCreateAPIView(APIView, ResponseViewMixin):
         return self.error_response(message="Validation failed", data=serializer.errors)
 
 
+class ProductBulkCreateView(APIView, ResponseViewMixin):
+    """
+    View to create many products in a single request (admin only).
+
+    Expects ``{"products": [...], "status": "approved"}`` where every product
+    carries a category UUID and ``status`` optionally sets the initial status
+    of the whole batch. All categories are resolved in one query and valid rows
+    are inserted in chunks with ``bulk_create``; invalid rows are reported per
+    index without aborting the rest of the batch.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request):
+        rows = request.data.get("products")
+        if not isinstance(rows, list) or not rows:
+            return self.error_response(message="products must be a non-empty list")
+        max_rows = getattr(settings, "BULK_PRODUCT_MAX_ROWS", 5000)
+        if len(rows) > max_rows:
+            return self.error_response(message=f"A batch may contain at most {max_rows} products")
+
+        initial_status = request.data.get("status", "pending")
+        if initial_status not in dict(Product.STATUS_CHOICES):
+            return self.error_response(message="Invalid status")
+
+        category_uuids = set()
+        for row in rows:
+            try:
+                category_uuids.add(UUID(str(row.get("category"))))
+            except (AttributeError, ValueError):
+                continue
+        categories = Category.objects.in_bulk(category_uuids, field_name="uuid")
+
+        serializer = ProductBulkCreateSerializer(
+            data=rows, many=True, context={"categories": categories}
+        )
+        if not serializer.is_valid():
+            return self.error_response(message="Validation failed", data=serializer.errors)
+
+        products = []
+        if serializer.validated_data:
+            products = serializer.save(created_by=request.user, status=initial_status)
+            # bulk_create skips model signals, so update the facet counts here.
+            new_rows = [product_facet_row(product) for product in products]
+            transaction.on_commit(lambda: adjust_facets(new_rows=new_rows))
+
+        data = {
+            "created": [
+                {"index": index, "uuid": str(product.uuid)}
+                for index, product in zip(serializer.valid_indexes, products)
+            ],
+            "errors": [
+                {"index": index, "errors": errors}
+                for index, errors in serializer.row_errors.items()
+            ],
+        }
+        if not products:
+            return self.error_response(message="No products created", data=data)
+        return self.success_response(data=data, message=f"{len(products)} products created")
+
+
+class ProductExportView(APIView, ResponseViewMixin):
+    """
+    View to stream a product export as CSV or NDJSON (admin only).
+
+    Rows are read from the database in chunks and written to the client as they
+    are produced, so server memory stays flat regardless of the catalog size.
+
+    Query parameters (list values may be repeated or comma separated):
+        export_format: ``csv`` (default) or ``ndjson``.
+        columns: Columns to export, defaults to ``DEFAULT_EXPORT_COLUMNS``.
+        Any filter accepted by ``apps.core.filters.filter_products``.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return self.error_response(message="Invalid export format")
+
+        columns = get_list_param(request.query_params, "columns") or DEFAULT_EXPORT_COLUMNS
+        invalid_columns = [column for column in columns if column not in EXPORT_COLUMNS]
+        if invalid_columns:
+            return self.error_response(message="Invalid columns", data=invalid_columns)
+
+        try:
+            products = filter_products(Product.objects.all(), request.query_params)
+        except InvalidFilter as exc:
+            return self.error_response(message=str(exc))
+
+        content_type, extension, stream = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(
+            stream(products.order_by("id"), columns), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="products.{extension}"'
+        return response
+
+
+class ProductSearchView(APIView, ResponseViewMixin):
+    """
+    View to search products by name and description.
+
+    Query parameters:
+        q: Search terms, every term is matched as a word prefix.
+        limit: Maximum number of results (default 20, at most 100).
+        Any filter accepted by ``apps.core.filters.filter_products``, applied
+        to the ranked matches.
+
+    Results are ranked by relevance using the database's full text index
+    (see ``apps.core.search``).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return self.error_response(message="Search query is required")
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 20)), 100))
+        except ValueError:
+            return self.error_response(message="Invalid limit")
+        products = search_products(query, limit)
+        if has_filters(request.query_params):
+            try:
+                matching = set(
+                    filter_products(Product.objects.filter(id__in=[product.id for product in products]),
+                                    request.query_params).values_list("id", flat=True)
+                )
+            except InvalidFilter as exc:
+                return self.error_response(message=str(exc))
+            products = [product for product in products if product.id in matching]
+        serializer = ProductSerializer(products, many=True)
+        return self.success_response(data=serializer.data)
+
+
+class ProductFacetsView(APIView, ResponseViewMixin):
+    """
+    View to return product counts per facet value (category, status,
+    is_active, price band and availability).
+
+    Without filters the counts are served from an incrementally maintained
+    cache; with filters (same parameters as the product list) they are
+    computed with grouped aggregate queries over the filtered products.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        queryset = None
+        if has_filters(request.query_params):
+            try:
+                queryset = filter_products(Product.objects.all(), request.query_params)
+            except InvalidFilter as exc:
+                return self.error_response(message=str(exc))
+        return self.success_response(data=get_product_facets(queryset))
+
+
 class ProductRetrieveUpdateDestroyAPIView(APIView, ResponseViewMixin):
     """
     This View handles retrieving, updating, and deleting a product.
@@ -119,13 +327,15 @@ class ProductRetrieveUpdateDestroyAPIView(APIView, ResponseViewMixin):
             Retrieves a product instance by its UUID.
 
         get(request, uuid):
-            Retrieves a product by UUID and returns its serialized data.
+            Retrieves a product by UUID and returns its serialized data with an ETag.
+            Answers ``If-None-Match`` with a 304 without serializing the product.
             Returns an error response if the product is not found.
 
         patch(request, uuid):
             Partially updates a product by UUID with the provided data.
             Triggers video processing if a video is updated.
-            Returns an error response if the product is not found or the update fails.
+            Returns an error response if the product is not found or the update fails,
+            and a 412 when an ``If-Match`` header no longer matches the product ETag.
 
         delete(request, uuid):
             Deletes a product by UUID.
@@ -133,33 +343,47 @@ class ProductRetrieveUpdateDestroyAPIView(APIView, ResponseViewMixin):
     """
     permission_classes = [IsAuthenticated]
 
-    def get_object(self, uuid):
-        return Product.objects.filter(uuid=uuid).first()
+    def get_object(self, uuid, lock=False):
+        queryset = Product.objects.select_for_update() if lock else Product.objects.all()
+        return queryset.filter(uuid=uuid).first()
 
     def get(self, request, uuid):
         product = self.get_object(uuid)
         if not product:
             return self.error_response(message="Product not found")
+        not_modified = self.evaluate_preconditions(request, product)
+        if not_modified:
+            return not_modified
         serializer = ProductSerializer(product)
-        return self.success_response(data=serializer.data)
+        response = self.success_response(data=serializer.data)
+        return self.set_etag(response, product)
 
     def patch(self, request, uuid):
-        product = self.get_object(uuid)
-        if not product:
-            return self.error_response(message="Product not found")
-        serializer = ProductSerializer(product, data=request.data, partial=True)
-        if serializer.is_valid():
+        with transaction.atomic():
+            product = self.get_object(uuid, lock=True)
+            if not product:
+                return self.error_response(message="Product not found")
+            precondition_failed = self.evaluate_preconditions(request, product)
+            if precondition_failed:
+                return precondition_failed
+            serializer = ProductSerializer(product, data=request.data, partial=True)
+            if not serializer.is_valid():
+                return self.error_response(message="Update failed", data=serializer.errors)
             updated_product = serializer.save()
-            if 'video' in request.data and updated_product.video:
-                process_product_video.delay(str(updated_product.uuid))
-            return self.success_response(data=serializer.data, message="Product updated")
-        return self.error_response(message="Update failed", data=serializer.errors)
+        if 'video' in request.data and updated_product.video:
+            process_product_video.delay(str(updated_product.uuid))
+        response = self.success_response(data=serializer.data, message="Product updated")
+        return self.set_etag(response, updated_product)
 
     def delete(self, request, uuid):
-        product = self.get_object(uuid)
-        if not product:
-            return self.error_response(message="Product not found")
-        product.delete()
+        with transaction.atomic():
+            product = self.get_object(uuid, lock=True)
+            if not product:
+                return self.error_response(message="Product not found")
+            precondition_failed = self.evaluate_preconditions(request, product)
+            if precondition_failed:
+                return precondition_failed
+            product.delete()
         return self.success_response(message="Product deleted")
 
 
@@ -183,10 +407,65 @@ class ProductApprovalView(APIView, ResponseViewMixin):
             return self.error_response(message="Product not found")
 
         product.status = "approved" if action == "approve" else "rejected"
-        product.save()
+        product.save(update_fields=["status", "updated_at"])
 
         return self.success_response(message=f"Product {action}ed successfully")
-    
+
+
+class ProductBulkApprovalView(APIView, ResponseViewMixin):
+    """
+    View to approve or reject many pending products at once.
+
+    Expects ``{"uuids": [...], "action": "approve" | "reject"}``. Only products
+    that are still pending are changed, with a single UPDATE; the response
+    reports which uuids changed, which were skipped because they are no longer
+    pending, and which do not exist.
+
+    The UPDATE stamps ``updated_at`` and the rows are re-read afterwards, so
+    "changed" lists exactly the rows this UPDATE wrote, even when a concurrent
+    request moved some of them out of pending first.
+    """
+    permission_classes = [IsAuthenticated, IsAdminOrStaff]
+
+    def post(self, request):
+        action = request.data.get("action")
+        if action not in ["approve", "reject"]:
+            return self.error_response(message="Invalid action")
+
+        uuids = request.data.get("uuids")
+        if not isinstance(uuids, list) or not uuids:
+            return self.error_response(message="uuids must be a non-empty list")
+        max_items = getattr(settings, "BULK_APPROVAL_MAX_ITEMS", 1000)
+        if len(uuids) > max_items:
+            return self.error_response(message=f"At most {max_items} products can be updated at once")
+        try:
+            uuids = {UUID(str(value)) for value in uuids}
+        except ValueError:
+            return self.error_response(message="Invalid product UUID")
+
+        new_status = "approved" if action == "approve" else "rejected"
+        with transaction.atomic():
+            stamp = timezone.now()
+            Product.objects.filter(uuid__in=uuids, status="pending").update(status=new_status, updated_at=stamp)
+            rows = list(Product.objects.filter(uuid__in=uuids).values("uuid", "updated_at", *FACET_FIELDS))
+            changed_rows = [
+                row for row in rows if row["status"] == new_status and row["updated_at"] == stamp
+            ]
+            changed = {row["uuid"] for row in changed_rows}
+            if changed_rows:
+                # update() skips model signals, so update the facet counts here.
+                old_rows = [dict(row, status="pending") for row in changed_rows]
+                transaction.on_commit(lambda: adjust_facets(old_rows, changed_rows))
+
+        found = {row["uuid"] for row in rows}
+        data = {
+            "changed": [str(value) for value in changed],
+            "skipped": [str(row["uuid"]) for row in rows if row["uuid"] not in changed],
+            "not_found": [str(value) for value in uuids - found],
+        }
+        return self.success_response(data=data, message=f"{len(changed)} products {new_status}")
+
+
 class MyProductsView(APIView, ResponseViewMixin):
     """
     View to retrieve the list of products uploaded by the authenticated user.
@@ -194,9 +473,9 @@ class MyProductsView(APIView, ResponseViewMixin):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        products = Product.objects.filter(created_by=request.user)
-        serializer = ProductSerializer(products, many=True)
-        return self.success_response(data=serializer.data, message="Your uploaded products")
+        products = Product.objects.filter(created_by=request.user).order_by('-created_at')
+        data = product_values_serializer.serialize(products)
+        return self.success_response(data=data, message="Your uploaded products")
     
 
 def dashboard_view(request):
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from apps.orders.models import Order, OrderItem
+from apps.orders.models import IdempotencyKey, Order, OrderItem, StockReservation
 # Register your models here.
 
 @admin.register(Order)
@@ -23,4 +23,29 @@ class OrderItemAdmin(admin.ModelAdmin):
         "product",
         "quantity",    
         "price_at_order",
-    ]
\ No newline at end of file
+    ]
+
+
+@admin.register(StockReservation)
+class StockReservationAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the StockReservation model.
+    """
+    list_display = [
+        "uuid",
+        "user",
+        "expires_at",
+    ]
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the IdempotencyKey model.
+    """
+    list_display = [
+        "key",
+        "user",
+        "response_code",
+        "expires_at",
+    ]
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.orders.models import ArchivedOrder, ArchivedOrderItem, Checkpoint, Order, OrderItem
+from apps.orders.rollups import SALES_ROLLUP_CHECKPOINT
+
+ORDER_ARCHIVE_CHECKPOINT = "order_archive"
+
+ORDER_FIELDS = ("id", "uuid", "user_id", "total_amount", "item_count", "created_at", "updated_at")
+ORDER_ITEM_FIELDS = ("id", "uuid", "order_id", "product_id", "quantity", "price_at_order", "created_at", "updated_at")
+
+
+def archive_batch(cutoff, batch_size):
+    """
+    Move the next batch of orders created before ``cutoff`` and their items
+    to the archive tables in one transaction. Returns the number of orders
+    moved; 0 means there is nothing left to archive.
+
+    Orders are taken in id order after the checkpoint and the batch stops at
+    the first order that is too recent, so the checkpoint never moves past an
+    order that still has to be archived later. Orders not yet folded into the
+    sales rollups are never archived.
+    """
+    with transaction.atomic():
+        checkpoint, _ = Checkpoint.objects.get_or_create(name=ORDER_ARCHIVE_CHECKPOINT)
+        checkpoint = Checkpoint.objects.select_for_update().get(pk=checkpoint.pk)
+        rollup_position = (
+            Checkpoint.objects.filter(name=SALES_ROLLUP_CHECKPOINT).values_list("position", flat=True).first() or 0
+        )
+        candidates = (
+            Order.objects.select_for_update()
+            .filter(id__gt=checkpoint.position, id__lte=rollup_position)
+            .order_by("id")
+            .values(*ORDER_FIELDS)[:batch_size]
+        )
+        orders = []
+        for order in candidates:
+            if order["created_at"] >= cutoff:
+                break
+            orders.append(order)
+        if not orders:
+            return 0
+
+        order_ids = [order["id"] for order in orders]
+        items = OrderItem.objects.filter(order_id__in=order_ids).values(*ORDER_ITEM_FIELDS)
+        ArchivedOrder.objects.bulk_create([ArchivedOrder(**order) for order in orders])
+        ArchivedOrderItem.objects.bulk_create([ArchivedOrderItem(**item) for item in items])
+        OrderItem.objects.filter(order_id__in=order_ids).delete()
+        Order.objects.filter(id__in=order_ids).delete()
+
+        checkpoint.position = order_ids[-1]
+        checkpoint.save(update_fields=["position", "updated_at"])
+    return len(orders)
+
+
+def archive_orders(older_than_days=None, batch_size=None, max_batches=None):
+    """
+    Archive orders older than ``older_than_days`` in bounded batches; an
+    interrupted run resumes from the stored checkpoint. Returns the number of
+    orders moved.
+    """
+    if older_than_days is None:
+        older_than_days = getattr(settings, "ORDER_ARCHIVE_AFTER_DAYS", 365)
+    batch_size = batch_size or getattr(settings, "ORDER_ARCHIVE_BATCH_SIZE", 500)
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved:
+            break
+        archived += moved
+        batches += 1
+    return archived
@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utils.lru import LRUCache
+
+ORDER_DETAIL_VERSION_KEY = "orders:detail:version"
+
+# Placed orders never change, but their rendered items show the live product
+# name and disappear when the product is deleted. Entries are therefore
+# stamped with a version kept in the shared cache, which is bumped whenever a
+# product is renamed or deleted (see ``apps.orders.signals``).
+order_detail_cache = LRUCache(
+    max_entries=getattr(settings, "ORDER_DETAIL_CACHE_MAX_ENTRIES", 10000),
+    max_bytes=getattr(settings, "ORDER_DETAIL_CACHE_MAX_BYTES", 32 * 1024 * 1024),
+    sizeof=lambda entry: len(entry[2]),
+)
+
+
+def get_order_detail_version():
+    """
+    Current version of the cached order details; read before loading an order
+    so a detail rendered from old product rows is never stored as current.
+    """
+    version = cache.get(ORDER_DETAIL_VERSION_KEY)
+    if version is None:
+        cache.add(ORDER_DETAIL_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(ORDER_DETAIL_VERSION_KEY)
+    return version
+
+
+def bump_order_detail_version():
+    try:
+        cache.incr(ORDER_DETAIL_VERSION_KEY)
+    except ValueError:
+        cache.add(ORDER_DETAIL_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def get_cached_order_detail(uuid, user_id, version):
+    """
+    Return ``(etag, content)`` of the cached order ``uuid`` if it belongs to
+    ``user_id`` and was rendered at ``version``, otherwise None. Entries of
+    other users are treated exactly like misses, so the cache can never
+    reveal that an order exists.
+    """
+    entry = order_detail_cache.get(uuid)
+    if entry is None or entry[0] != user_id:
+        return None
+    if entry[3] != version:
+        order_detail_cache.delete(uuid)
+        return None
+    return entry[1], entry[2]
+
+
+def cache_order_detail(uuid, user_id, etag, content, version):
+    """
+    Store the rendered detail response of order ``uuid`` owned by ``user_id``,
+    rendered at ``version``, unless it is already cached.
+    """
+    order_detail_cache.add(uuid, (user_id, etag, content, version))
@@ -0,0 +1,92 @@
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from apps.orders.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request):
+    """
+    Hash of the method, path and parsed payload, used to reject a key that is
+    reused for a different request.
+    """
+    payload = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(f"{request.method}:{request.path}:{payload}".encode()).hexdigest()
+
+
+def claim_key(user, key, fingerprint):
+    """
+    Insert the key row for ``user``; return ``(record, created)``.
+
+    Must run inside the transaction that performs the request. Because the
+    row only becomes visible when that transaction commits, a concurrent
+    request with the same key blocks on the unique constraint until the first
+    one finishes, then finds the stored response (or, if the first one rolled
+    back, claims the key itself).
+    """
+    now = timezone.now()
+    IdempotencyKey.objects.filter(user=user, key=key, expires_at__lte=now).delete()
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                user=user,
+                key=key,
+                fingerprint=fingerprint,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+            )
+        return record, True
+    except IntegrityError:
+        return IdempotencyKey.objects.get(user=user, key=key), False
+
+
+def idempotent(method):
+    """
+    Honor the ``Idempotency-Key`` header on an APIView handler.
+
+    The first response for a (user, key) pair is stored for
+    ``IDEMPOTENCY_KEY_TTL`` seconds and replayed verbatim for retries, without
+    calling the handler again. Server errors are not stored, so a request that
+    failed with a 5xx can be retried with the same key.
+    """
+    @wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return method(view, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return view.error_response(message=f"{IDEMPOTENCY_HEADER} is too long")
+
+        fingerprint = request_fingerprint(request)
+        with transaction.atomic():
+            record, created = claim_key(request.user, key, fingerprint)
+            if not created:
+                if record.fingerprint != fingerprint:
+                    return view.error_response(
+                        message=f"{IDEMPOTENCY_HEADER} was already used for a different request",
+                        code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                response = view.rendered_response(record.response_body, code=record.response_code)
+                response[REPLAYED_HEADER] = "true"
+                return response
+
+            response = method(view, request, *args, **kwargs)
+            if response.status_code >= 500:
+                transaction.set_rollback(True)
+                return response
+            record.response_code = response.status_code
+            record.response_body = JSONRenderer().render(response.data).decode()
+            record.save(update_fields=["response_code", "response_body", "updated_at"])
+        return response
+    return wrapper
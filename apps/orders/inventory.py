@@ -0,0 +1,123 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from apps.core.facets import FACET_FIELDS, adjust_facets
+from apps.core.models import Product
+from apps.orders.leaderboard import record_sales
+from apps.orders.models import Order, OrderItem, StockReservation, StockReservationItem
+
+
+class InsufficientStock(Exception):
+    """
+    Raised when a product does not have enough stock left for a reservation.
+    """
+
+    def __init__(self, product_id):
+        super().__init__(product_id)
+        self.product_id = product_id
+
+
+def resolve_cart(items):
+    """
+    Load the products of validated cart ``items`` with a single query.
+
+    Returns ``(products, missing)`` where ``products`` maps product uuid to
+    Product and ``missing`` lists unknown uuids in request order.
+    """
+    products = Product.objects.in_bulk({item["product_uuid"] for item in items}, field_name="uuid")
+    missing = []
+    for item in items:
+        if item["product_uuid"] not in products and str(item["product_uuid"]) not in missing:
+            missing.append(str(item["product_uuid"]))
+    return products, missing
+
+
+def cart_quantities(items, products):
+    """
+    Total quantity per product id, merging repeated lines for the same product.
+    """
+    quantities = defaultdict(int)
+    for item in items:
+        quantities[products[item["product_uuid"]].id] += item["quantity"]
+    return dict(quantities)
+
+
+def _sync_availability_facets(quantities, sign):
+    # Stock moves through update(), which skips model signals; only products
+    # crossing zero change the cached availability facet.
+    rows = Product.objects.filter(pk__in=list(quantities)).values("id", *FACET_FIELDS)
+    old_rows, new_rows = [], []
+    for row in rows:
+        previous = row["stock"] - sign * quantities[row["id"]]
+        if (previous > 0) != (row["stock"] > 0):
+            old_rows.append(dict(row, stock=previous))
+            new_rows.append(row)
+    if old_rows:
+        transaction.on_commit(lambda: adjust_facets(old_rows, new_rows))
+
+
+def reserve_stock(quantities):
+    """
+    Atomically take ``quantities`` ({product_id: quantity}) out of stock.
+
+    Every product is decremented with a conditional ``UPDATE ... SET stock =
+    stock - qty WHERE stock >= qty``, so concurrent checkouts can never drive
+    stock below zero. Rows are updated in ascending id order, so concurrent
+    carts always lock products in the same order and cannot deadlock. Must be
+    called inside ``transaction.atomic()``; raises ``InsufficientStock`` and
+    leaves the caller to roll back the products already decremented.
+    """
+    for product_id in sorted(quantities):
+        quantity = quantities[product_id]
+        updated = Product.objects.filter(pk=product_id, stock__gte=quantity).update(
+            stock=F("stock") - quantity
+        )
+        if not updated:
+            raise InsufficientStock(product_id)
+    _sync_availability_facets(quantities, -1)
+
+
+def release_stock(quantities):
+    """
+    Return ``quantities`` ({product_id: quantity}) to stock.
+    """
+    for product_id in sorted(quantities):
+        Product.objects.filter(pk=product_id).update(stock=F("stock") + quantities[product_id])
+    _sync_availability_facets(quantities, 1)
+
+
+def release_reservations(reservation_ids):
+    """
+    Return the stock held by ``reservation_ids`` and delete the reservations.
+    Must be called inside ``transaction.atomic()`` with the reservations locked.
+    """
+    quantities = dict(
+        StockReservationItem.objects.filter(reservation_id__in=reservation_ids)
+        .values("product_id")
+        .annotate(quantity=Sum("quantity"))
+        .values_list("product_id", "quantity")
+    )
+    release_stock(quantities)
+    StockReservation.objects.filter(id__in=reservation_ids).delete()
+
+
+def create_order(user, order_items, **fields):
+    """
+    Create an order for ``user`` from unsaved ``order_items``, storing its
+    totals on the order and inserting the items with a single bulk_create.
+    Extra ``fields`` (e.g. a pre-assigned ``uuid``) are set on the order.
+    Also adds the items to the product sales counters.
+    """
+    order = Order.objects.create(
+        user=user,
+        **fields,
+        total_amount=sum(item.quantity * item.price_at_order for item in order_items),
+        item_count=sum(item.quantity for item in order_items),
+    )
+    for item in order_items:
+        item.order = order
+    OrderItem.objects.bulk_create(order_items)
+    record_sales(order_items)
+    return order
@@ -0,0 +1,162 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BigIntegerField, Case, F, Value, When
+from django.utils import timezone
+
+from apps.orders.models import ProductSalesCounter
+
+TOP_SELLERS_VERSION_KEY = "orders:top_sellers:version"
+TOP_SELLERS_SNAPSHOT_KEY = "orders:top_sellers:snapshot"
+
+# Counters changed this long before the last sync are read again, so a
+# transaction that stamped updated_at before the sync but committed after it
+# is never missed. Re-reading is harmless: rows carry absolute totals.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def record_sales(order_items):
+    """
+    Add the quantities of ``order_items`` to the product sales counters.
+
+    Runs inside the order transaction: missing counters are created, then all
+    counters of the order are incremented with a single ``UPDATE ... SET
+    units_sold = units_sold + CASE ...``, so concurrent orders never lose an
+    increment. Leaderboards in every process are told to sync on commit.
+    """
+    quantities = {}
+    for item in order_items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    ProductSalesCounter.objects.bulk_create(
+        [ProductSalesCounter(product_id=product_id) for product_id in sorted(quantities)],
+        ignore_conflicts=True,
+    )
+    ProductSalesCounter.objects.filter(product_id__in=quantities).update(
+        units_sold=F("units_sold") + Case(
+            *[When(product_id=product_id, then=Value(quantity)) for product_id, quantity in quantities.items()],
+            output_field=BigIntegerField(),
+        ),
+        updated_at=timezone.now(),
+    )
+    transaction.on_commit(bump_top_sellers_version)
+
+
+def bump_top_sellers_version():
+    try:
+        cache.incr(TOP_SELLERS_VERSION_KEY)
+    except ValueError:
+        cache.add(TOP_SELLERS_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def counter_rows(queryset):
+    return queryset.values_list("product_id", "product__category_id", "units_sold")
+
+
+class Leaderboard(object):
+    """
+    In-process top sellers ranking, overall and per category.
+
+    Each ranking is a list of ``(-units_sold, product_id)`` kept sorted with
+    bisect, so top-K reads are a slice and an update moves one entry.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.products = {}
+        self.rankings = {None: []}
+        self.version = None
+        self.synced_at = None
+
+    def set(self, product_id, category_id, units_sold):
+        previous = self.products.get(product_id)
+        if previous is not None:
+            for key in (None, previous[0]):
+                ranking = self.rankings[key]
+                del ranking[bisect_left(ranking, (-previous[1], product_id))]
+        self.products[product_id] = (category_id, units_sold)
+        for key in (None, category_id):
+            insort(self.rankings.setdefault(key, []), (-units_sold, product_id))
+
+    def discard(self, product_id):
+        with self.lock:
+            previous = self.products.pop(product_id, None)
+            if previous is not None:
+                for key in (None, previous[0]):
+                    ranking = self.rankings[key]
+                    del ranking[bisect_left(ranking, (-previous[1], product_id))]
+
+    def top(self, limit, category_id=None):
+        """
+        ``[(product_id, units_sold)]`` for the ``limit`` best sellers.
+        """
+        with self.lock:
+            return [(product_id, -units) for units, product_id in self.rankings.get(category_id, [])[:limit]]
+
+    def load(self, rows, taken_at):
+        with self.lock:
+            self.products = {}
+            self.rankings = {None: []}
+            for product_id, category_id, units_sold in rows:
+                self.set(product_id, category_id, units_sold)
+            self.synced_at = taken_at
+
+    def sync(self):
+        """
+        Apply counters changed since the last sync when another process has
+        recorded sales; a no-op costing one cache read otherwise.
+        """
+        version = cache.get(TOP_SELLERS_VERSION_KEY)
+        if version is not None and version == self.version:
+            return
+        started_at = timezone.now()
+        rows = counter_rows(ProductSalesCounter.objects.filter(updated_at__gte=self.synced_at - SYNC_OVERLAP))
+        with self.lock:
+            for product_id, category_id, units_sold in rows:
+                self.set(product_id, category_id, units_sold)
+            self.version = version
+            self.synced_at = started_at
+
+
+def take_snapshot():
+    """
+    Store all non-zero counters in the cache as a compact list of
+    ``[product_id, category_id, units_sold]`` rows, and return it.
+    """
+    taken_at = timezone.now()
+    rows = [list(row) for row in counter_rows(ProductSalesCounter.objects.filter(units_sold__gt=0))]
+    snapshot = {"taken_at": taken_at.isoformat(), "rows": rows}
+    cache.set(TOP_SELLERS_SNAPSHOT_KEY, snapshot, timeout=None)
+    return snapshot
+
+
+_leaderboard = None
+_leaderboard_lock = threading.Lock()
+
+
+def get_leaderboard():
+    """
+    The process wide leaderboard, built from the cached snapshot (or the
+    counters table when there is none) on first use and synced on every call.
+    """
+    global _leaderboard
+    if _leaderboard is None:
+        with _leaderboard_lock:
+            if _leaderboard is None:
+                snapshot = cache.get(TOP_SELLERS_SNAPSHOT_KEY) or take_snapshot()
+                leaderboard = Leaderboard()
+                leaderboard.load(snapshot["rows"], datetime.fromisoformat(snapshot["taken_at"]))
+                _leaderboard = leaderboard
+    _leaderboard.sync()
+    return _leaderboard
+
+
+def reset_leaderboard():
+    """
+    Drop the process wide leaderboard so the next read rebuilds it.
+    """
+    global _leaderboard
+    _leaderboard = None
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.archive import archive_orders
+
+
+class Command(BaseCommand):
+    """
+    Move old orders and their items to the archive tables.
+
+    Runs in bounded batches, one transaction each, resuming from the stored
+    checkpoint, so it is safe to interrupt and re-run against a live database.
+    """
+    help = "Archive orders older than ORDER_ARCHIVE_AFTER_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=None)
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches.")
+
+    def handle(self, *args, **options):
+        archived = archive_orders(
+            older_than_days=options["older_than_days"],
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} orders"))
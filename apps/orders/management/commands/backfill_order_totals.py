@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+
+from apps.orders.models import Order, OrderItem
+
+
+class Command(BaseCommand):
+    """
+    Recompute ``Order.total_amount`` and ``item_count`` from the order items.
+
+    Orders are walked in primary key order, one chunk per transaction, so the
+    command can run against a live database and be interrupted and restarted
+    (with ``--start-after``) without redoing finished chunks.
+    """
+    help = "Backfill denormalized order totals in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--start-after", type=int, default=0, help="Resume after this order id.")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        last_id = options["start_after"]
+        line_total = ExpressionWrapper(
+            F("quantity") * F("price_at_order"),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        )
+        updated = 0
+        while True:
+            with transaction.atomic():
+                orders = list(
+                    Order.objects.select_for_update()
+                    .filter(id__gt=last_id)
+                    .order_by("id")
+                    .only("id", "total_amount", "item_count")[:chunk_size]
+                )
+                if not orders:
+                    break
+                totals = {
+                    row["order_id"]: row
+                    for row in OrderItem.objects.filter(order_id__in=[order.id for order in orders])
+                    .values("order_id")
+                    .annotate(total_amount=Sum(line_total), item_count=Sum("quantity"))
+                }
+                for order in orders:
+                    row = totals.get(order.id, {})
+                    order.total_amount = row.get("total_amount") or 0
+                    order.item_count = row.get("item_count") or 0
+                Order.objects.bulk_update(orders, ["total_amount", "item_count"])
+            updated += len(orders)
+            last_id = orders[-1].id
+            self.stdout.write(f"Backfilled {updated} orders (last id {last_id})")
+
+        self.stdout.write(self.style.SUCCESS(f"Done, {updated} orders backfilled"))
@@ -0,0 +1,62 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.core.models import Category, Product
+from apps.orders.views import CreateOrderView
+from apps.users.models import AppUser
+
+
+class Command(BaseCommand):
+    """
+    Measure CreateOrderView latency and query count as a function of cart size.
+
+    Requests go through the real view with APIRequestFactory. All data is
+    created inside a transaction that is rolled back at the end.
+    """
+    help = "Benchmark order creation latency by cart size."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1,5,10,25,50,100")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        view = CreateOrderView.as_view()
+        factory = APIRequestFactory()
+
+        with transaction.atomic():
+            user = AppUser.objects.create(email=f"benchmark-{uuid.uuid4()}@example.com", first_name="Benchmark")
+            category = Category.objects.create(name=f"benchmark-{uuid.uuid4()}")
+            products = Product.objects.bulk_create([
+                Product(name=f"Product {i}", category=category, price=10, stock=10 ** 6, created_by=user)
+                for i in range(max(sizes))
+            ])
+
+            self.stdout.write(f"{'cart size':>10} {'median ms':>10} {'p95 ms':>10} {'queries':>8}")
+            for size in sizes:
+                payload = {
+                    "items": [{"product_uuid": str(product.uuid), "quantity": 1} for product in products[:size]]
+                }
+                timings = []
+                for _ in range(options["repeat"]):
+                    request = factory.post("/orders/create/", payload, format="json")
+                    force_authenticate(request, user=user)
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        response = view(request)
+                        timings.append((time.perf_counter() - start) * 1000)
+                    if response.status_code != 200:
+                        self.stderr.write(f"Unexpected response: {response.data}")
+                        return
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                self.stdout.write(
+                    f"{size:>10} {statistics.median(timings):>10.2f} {p95:>10.2f} {len(queries):>8}"
+                )
+            transaction.set_rollback(True)
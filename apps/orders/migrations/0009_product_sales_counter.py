@@ -0,0 +1,44 @@
+# Generated by Django 4.2.23 on 2026-10-18 18:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_counters(apps, schema_editor):
+    ProductSalesCounter = apps.get_model("orders", "ProductSalesCounter")
+    units = {}
+    for model_name in ("OrderItem", "ArchivedOrderItem"):
+        rows = (
+            apps.get_model("orders", model_name).objects.order_by()
+            .values("product_id").annotate(units=models.Sum("quantity"))
+        )
+        for row in rows:
+            units[row["product_id"]] = units.get(row["product_id"], 0) + row["units"]
+    ProductSalesCounter.objects.bulk_create(
+        [ProductSalesCounter(product_id=product_id, units_sold=total) for product_id, total in units.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_product_search_index'),
+        ('orders', '0008_order_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSalesCounter',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sales_counter', serialize=False, to='core.product')),
+                ('units_sold', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at'], name='sales_counter_updated_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from apps.users.models import AppUser as User
-from apps.core.models import Product
+from apps.core.models import Category, Product
 from utils.models import TimeStampModel
 import uuid
 
@@ -8,9 +8,20 @@ import uuid
 class Order(TimeStampModel):
     """
     Order model represents a customer's order, including the user who placed it.
+
+    ``total_amount`` and ``item_count`` are denormalized from the order items
+    when the order is placed, so order lists do not have to load the items.
     """
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    item_count = models.PositiveIntegerField(default=0, help_text="Total quantity of all order items.")
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of a user's order history, newest first.
+            models.Index(fields=['user', 'created_at', 'id'], name='order_user_created_idx'),
+        ]
 
 class OrderItem(TimeStampModel):
     """
@@ -21,3 +32,168 @@ class OrderItem(TimeStampModel):
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField()
     price_at_order = models.DecimalField(max_digits=10, decimal_places=2)
+
+
+class StockReservation(TimeStampModel):
+    """
+    StockReservation holds product stock for a user's cart until it is checked out or expires.
+    """
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="stock_reservations")
+    expires_at = models.DateTimeField(db_index=True)
+
+
+class StockReservationItem(TimeStampModel):
+    """
+    StockReservationItem is the quantity of a single product held by a reservation.
+    """
+    reservation = models.ForeignKey(StockReservation, on_delete=models.CASCADE, related_name="items")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    quantity = models.PositiveIntegerField()
+
+
+class IdempotencyKey(TimeStampModel):
+    """
+    IdempotencyKey stores the response of a request made with an ``Idempotency-Key``
+    header so retries of the same request can be answered without repeating it.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    response_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.TextField(blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="orders_idempotency_user_key_uniq"),
+        ]
+
+
+class OrderIntake(TimeStampModel):
+    """
+    OrderIntake is an order accepted by the asynchronous intake and waiting to be
+    placed by a worker. Placed intakes are deleted; rejected ones are kept, with
+    the reason, so the client polling the order uuid can see the outcome.
+    """
+    QUEUED = "queued"
+    REJECTED = "rejected"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (REJECTED, "Rejected"),
+    ]
+
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="order_intakes")
+    items = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    reason = models.CharField(max_length=255, blank=True)
+
+
+class Checkpoint(TimeStampModel):
+    """
+    Checkpoint stores how far a background job has processed a table, so it
+    can resume from ``position`` (an id high-water mark) instead of rescanning.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    position = models.BigIntegerField(default=0)
+
+
+class SalesRollup(models.Model):
+    """
+    Abstract daily sales totals, maintained incrementally by ``update_sales_rollups``.
+    """
+    day = models.DateField()
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class DailyProductSales(SalesRollup):
+    """
+    Units, revenue and orders per product per day.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="daily_sales")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["product", "day"], name="orders_daily_product_sales_uniq"),
+        ]
+        indexes = [models.Index(fields=["day"], name="daily_product_sales_day_idx")]
+
+
+class DailyCategorySales(SalesRollup):
+    """
+    Units, revenue and orders per category per day.
+    """
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="daily_sales")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["category", "day"], name="orders_daily_category_sales_uniq"),
+        ]
+        indexes = [models.Index(fields=["day"], name="daily_category_sales_day_idx")]
+
+
+class DailyUserSales(SalesRollup):
+    """
+    Units, revenue and orders per customer per day. Every order belongs to one
+    user, so summing these rows also gives exact store-wide daily totals.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_sales")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="orders_daily_user_sales_uniq"),
+        ]
+        indexes = [models.Index(fields=["day"], name="daily_user_sales_day_idx")]
+
+
+class ArchivedOrder(models.Model):
+    """
+    ArchivedOrder is an Order moved out of the hot table by ``archive_orders``.
+    It keeps the original id, uuid and timestamps, so archived orders sort and
+    paginate exactly like hot ones.
+    """
+    uuid = models.UUIDField(editable=False, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_orders")
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='archived_order_user_idx'),
+        ]
+
+
+class ArchivedOrderItem(models.Model):
+    """
+    ArchivedOrderItem is an OrderItem of an archived order.
+    """
+    uuid = models.UUIDField(editable=False, unique=True)
+    order = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE, related_name="items")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    quantity = models.PositiveIntegerField()
+    price_at_order = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+
+class ProductSalesCounter(TimeStampModel):
+    """
+    ProductSalesCounter is the running total of units sold per product, bumped
+    atomically in the transaction that places an order. ``updated_at`` is
+    indexed so readers can pick up only the counters changed since they last
+    looked.
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name="sales_counter")
+    units_sold = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"], name="sales_counter_updated_idx")]
@@ -0,0 +1,189 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.orders.models import (
+    Checkpoint,
+    DailyCategorySales,
+    DailyProductSales,
+    DailyUserSales,
+    Order,
+    OrderItem,
+)
+
+SALES_ROLLUP_CHECKPOINT = "sales_rollups"
+
+# rollup model -> (key field, OrderItem lookup that yields the key)
+ROLLUPS = {
+    DailyProductSales: ("product_id", F("product_id")),
+    DailyCategorySales: ("category_id", F("product__category_id")),
+    DailyUserSales: ("user_id", F("order__user_id")),
+}
+
+ROLLUP_METRICS = ("quantity", "revenue", "order_count")
+
+WRITE_BATCH_SIZE = 1000
+
+
+def aggregate_sales(first_order_id, last_order_id, item_model=OrderItem):
+    """
+    Aggregate the items of orders with ids in ``(first_order_id, last_order_id]``.
+    ``item_model`` may also be ``ArchivedOrderItem``, which has the same shape.
+
+    Returns ``{rollup model: {(day, key): {metric: value}}}``. Ranges always
+    contain whole orders, so per range order counts can simply be added up.
+    """
+    items = item_model.objects.filter(order_id__gt=first_order_id, order_id__lte=last_order_id)
+    line_total = ExpressionWrapper(
+        F("quantity") * F("price_at_order"),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+    sales = {}
+    for model, (key_field, lookup) in ROLLUPS.items():
+        rows = (
+            items.order_by()
+            .values(day=TruncDate("order__created_at"), key=lookup)
+            .annotate(
+                total_quantity=Sum("quantity"),
+                total_revenue=Sum(line_total),
+                total_orders=Count("order_id", distinct=True),
+            )
+        )
+        sales[model] = {
+            (row["day"], row["key"]): {
+                "quantity": row["total_quantity"],
+                "revenue": row["total_revenue"],
+                "order_count": row["total_orders"],
+            }
+            for row in rows
+        }
+    return sales
+
+
+def merge_sales(total, sales):
+    """
+    Add the aggregates of ``sales`` into ``total`` (both from ``aggregate_sales``).
+    """
+    for model, groups in sales.items():
+        merged = total.setdefault(model, {})
+        for group, metrics in groups.items():
+            if group in merged:
+                merged[group] = {metric: merged[group][metric] + metrics[metric] for metric in ROLLUP_METRICS}
+            else:
+                merged[group] = dict(metrics)
+    return total
+
+
+def apply_sales(sales):
+    """
+    Add aggregated ``sales`` to the rollup tables: existing rows are loaded and
+    incremented in one bulk_update, missing rows are inserted with bulk_create.
+    Must run inside the transaction that holds the checkpoint lock.
+    """
+    for model, groups in sales.items():
+        if not groups:
+            continue
+        key_field = ROLLUPS[model][0]
+        existing = model.objects.filter(
+            day__in={day for day, _ in groups},
+            **{f"{key_field}__in": {key for _, key in groups}},
+        )
+        changed = []
+        for row in existing:
+            metrics = groups.pop((row.day, getattr(row, key_field)), None)
+            if metrics is None:
+                continue
+            for metric in ROLLUP_METRICS:
+                setattr(row, metric, getattr(row, metric) + metrics[metric])
+            changed.append(row)
+        model.objects.bulk_update(changed, ROLLUP_METRICS, batch_size=WRITE_BATCH_SIZE)
+        model.objects.bulk_create([
+            model(day=day, **{key_field: key}, **metrics) for (day, key), metrics in groups.items()
+        ], batch_size=WRITE_BATCH_SIZE)
+
+
+def lock_checkpoint():
+    checkpoint, _ = Checkpoint.objects.get_or_create(name=SALES_ROLLUP_CHECKPOINT)
+    return Checkpoint.objects.select_for_update().get(pk=checkpoint.pk)
+
+
+def update_rollups(batch_size=None):
+    """
+    Fold orders placed since the stored high-water mark into the rollups, one
+    batch of orders per transaction, and advance the mark with each batch.
+
+    The mark is an Order id. Orders newer than ``SALES_ROLLUP_LAG`` seconds are
+    left for the next run, so an order whose id was allocated before, but
+    committed after, a newer one is not skipped. A batch stops before the
+    first such order, so the mark never passes it and every id in the batch
+    range belongs to an order old enough to fold. Returns the number of orders
+    processed.
+    """
+    batch_size = batch_size or getattr(settings, "SALES_ROLLUP_BATCH_SIZE", 1000)
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, "SALES_ROLLUP_LAG", 60))
+    processed = 0
+    while True:
+        with transaction.atomic():
+            checkpoint = lock_checkpoint()
+            order_ids = []
+            for order_id, created_at in (
+                Order.objects.filter(id__gt=checkpoint.position)
+                .order_by("id")
+                .values_list("id", "created_at")[:batch_size]
+            ):
+                if created_at > cutoff:
+                    break
+                order_ids.append(order_id)
+            if not order_ids:
+                break
+            apply_sales(aggregate_sales(checkpoint.position, order_ids[-1]))
+            checkpoint.position = order_ids[-1]
+            checkpoint.save(update_fields=["position", "updated_at"])
+        processed += len(order_ids)
+    return processed
+
+
+# dimension -> (rollup model, key field, related fields rendered with each row)
+REPORT_DIMENSIONS = {
+    "product": (DailyProductSales, "product", ("uuid", "name")),
+    "category": (DailyCategorySales, "category", ("uuid", "name")),
+    "user": (DailyUserSales, "user", ("uuid", "email")),
+    "day": (DailyUserSales, "day", ()),
+}
+
+
+def sales_report(dimension, start_date=None, end_date=None, limit=50):
+    """
+    Sales totals grouped by ``dimension`` between two inclusive dates, read
+    from the rollup tables only. Days are listed in date order, everything
+    else by revenue, highest first.
+    """
+    model, key, related = REPORT_DIMENSIONS[dimension]
+    rows = model.objects.all()
+    if start_date:
+        rows = rows.filter(day__gte=start_date)
+    if end_date:
+        rows = rows.filter(day__lte=end_date)
+    columns = [key] if dimension == "day" else [f"{key}__{field}" for field in related]
+    rows = rows.values(*columns).annotate(
+        quantity=Sum("quantity"), revenue=Sum("revenue"), order_count=Sum("order_count")
+    )
+    rows = rows.order_by("day") if dimension == "day" else rows.order_by("-revenue", f"{key}__uuid")[:limit]
+
+    report = []
+    for row in rows:
+        if dimension == "day":
+            entry = {"day": row["day"].isoformat()}
+        else:
+            entry = {field: str(row[f"{key}__{field}"]) for field in related}
+        entry.update(
+            quantity=row["quantity"],
+            revenue="{:.2f}".format(row["revenue"]),
+            order_count=row["order_count"],
+        )
+        report.append(entry)
+    return report
@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from apps.orders.models import Order, OrderItem
+from apps.orders.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
 from apps.core.models import Product
+from utils.serializers import ValuesSerializer
 
 class OrderItemCreateSerializer(serializers.Serializer):
     product_uuid = serializers.UUIDField()
@@ -8,15 +9,36 @@ class OrderItemCreateSerializer(serializers.Serializer):
 
 class OrderCreateSerializer(serializers.Serializer):
     """
-    Serializer for creating an order, validates that the order contains at least one item.
+    Serializer for creating an order, either from a list of items or by checking
+    out a stock reservation. Validates that the order contains at least one item.
     """
-    items = OrderItemCreateSerializer(many=True)
+    items = OrderItemCreateSerializer(many=True, required=False)
+    reservation = serializers.UUIDField(required=False)
 
     def validate_items(self, value):
         if not value:
             raise serializers.ValidationError("Order must have at least one item.")
         return value
 
+    def validate(self, attrs):
+        if "items" in attrs and "reservation" in attrs:
+            raise serializers.ValidationError("Provide either items or a reservation, not both.")
+        if "items" not in attrs and "reservation" not in attrs:
+            raise serializers.ValidationError("Order must have at least one item.")
+        return attrs
+
+
+class StockReservationCreateSerializer(serializers.Serializer):
+    """
+    Serializer for reserving stock for a cart, validates that the cart contains at least one item.
+    """
+    items = OrderItemCreateSerializer(many=True)
+
+    def validate_items(self, value):
+        if not value:
+            raise serializers.ValidationError("Reservation must have at least one item.")
+        return value
+
 class OrderItemSerializer(serializers.ModelSerializer):
     """
     Serializer for OrderItem model, includes fields for UUID, product, product name, quantity, and price at the time of order.
@@ -35,4 +57,56 @@ class OrderSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Order
-        fields = ['uuid', 'user', 'created_at', 'updated_at', 'items']
\ No newline at end of file
+        fields = ['uuid', 'user', 'total_amount', 'item_count', 'created_at', 'updated_at', 'items']
+
+
+class ArchivedOrderItemSerializer(OrderItemSerializer):
+    """
+    Serializer for ArchivedOrderItem, renders exactly like OrderItemSerializer.
+    """
+
+    class Meta(OrderItemSerializer.Meta):
+        model = ArchivedOrderItem
+
+class ArchivedOrderSerializer(OrderSerializer):
+    """
+    Serializer for ArchivedOrder, renders exactly like OrderSerializer.
+    """
+    items = ArchivedOrderItemSerializer(many=True, read_only=True)
+
+    class Meta(OrderSerializer.Meta):
+        model = ArchivedOrder
+
+
+# Read-only fast path for order list endpoints, same output as OrderSerializer.
+# On its own it renders the summary form of an order, without items.
+order_values_serializer = ValuesSerializer(OrderSerializer, exclude=['items'])
+order_item_values_serializer = ValuesSerializer(OrderItemSerializer)
+
+
+def serialize_orders(queryset):
+    """
+    Serialize orders with their items using two ``values()`` queries.
+    """
+    return serialize_order_rows(list(queryset.values("id", *order_values_serializer.lookups)))
+
+
+def serialize_order_rows(orders, item_model=OrderItem):
+    """
+    Serialize order ``values()`` rows (``id`` plus ``order_values_serializer.lookups``)
+    with their items, loaded with one query. Pass ``ArchivedOrderItem`` as
+    ``item_model`` for rows of archived orders.
+    """
+    items = {order["id"]: [] for order in orders}
+    item_rows = (
+        item_model.objects.filter(order_id__in=list(items))
+        .order_by("id")
+        .values("order_id", *order_item_values_serializer.lookups)
+    )
+    for item in item_rows:
+        items[item["order_id"]].append(item)
+
+    data = order_values_serializer.serialize_rows(orders)
+    for order, row in zip(data, orders):
+        order["items"] = order_item_values_serializer.serialize_rows(items[row["id"]])
+    return data
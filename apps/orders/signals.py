@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.core.models import Product
+from apps.orders.cache import bump_order_detail_version
+from apps.orders.leaderboard import bump_top_sellers_version
+from apps.orders.models import ProductSalesCounter
+
+
+@receiver(pre_save, sender=Product)
+def detect_product_changes(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Note whether a saved product changes the category or name that order
+    reads depend on.
+    """
+    instance._category_changed = instance._name_changed = False
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & {"category", "category_id", "name"}:
+        return
+    previous = Product.objects.filter(pk=instance.pk).values("category_id", "name").first()
+    if previous is not None:
+        instance._category_changed = previous["category_id"] != instance.category_id
+        instance._name_changed = previous["name"] != instance.name
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    if getattr(instance, "_category_changed", False):
+        # Touch the sales counter so leaderboards re-read it and rank the
+        # product under its new category.
+        if ProductSalesCounter.objects.filter(product_id=instance.pk).update(updated_at=timezone.now()):
+            transaction.on_commit(bump_top_sellers_version)
+    if getattr(instance, "_name_changed", False):
+        transaction.on_commit(bump_order_detail_version)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    # Deleting a product cascades to its order items.
+    transaction.on_commit(bump_order_detail_version)
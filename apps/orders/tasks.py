@@ -0,0 +1,145 @@
+import logging
+from uuid import UUID
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.orders.archive import archive_orders
+from apps.orders.leaderboard import take_snapshot
+from apps.orders.inventory import (
+    InsufficientStock,
+    cart_quantities,
+    create_order,
+    release_reservations,
+    reserve_stock,
+    resolve_cart,
+)
+from apps.orders.models import IdempotencyKey, OrderIntake, OrderItem, StockReservation
+from apps.orders.rollups import update_rollups
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def release_expired_reservations(batch_size=500):
+    """
+    Give the stock of abandoned carts back, one bounded batch per transaction.
+    """
+    now = timezone.now()
+    released = 0
+    while True:
+        with transaction.atomic():
+            reservation_ids = list(
+                StockReservation.objects.select_for_update(skip_locked=True)
+                .filter(expires_at__lte=now)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not reservation_ids:
+                break
+            release_reservations(reservation_ids)
+        released += len(reservation_ids)
+    return released
+
+
+@shared_task
+def purge_expired_idempotency_keys():
+    """
+    Delete stored idempotent responses past their TTL.
+    """
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def place_intake(intake, products):
+    """
+    Place one queued order inside its own savepoint; on any failure the intake
+    is marked rejected and nothing else of it is kept, so one bad intake does
+    not roll back the rest of its batch.
+    """
+    items = [
+        {"product_uuid": UUID(item["product_uuid"]), "quantity": item["quantity"]}
+        for item in intake.items
+    ]
+    missing = [str(item["product_uuid"]) for item in items if item["product_uuid"] not in products]
+    if missing:
+        intake.reason = f"Products not found: {', '.join(missing)}"
+    else:
+        try:
+            with transaction.atomic():
+                reserve_stock(cart_quantities(items, products))
+                create_order(intake.user, [
+                    OrderItem(
+                        product=products[item["product_uuid"]],
+                        quantity=item["quantity"],
+                        price_at_order=products[item["product_uuid"]].price
+                    )
+                    for item in items
+                ], uuid=intake.uuid)
+            return True
+        except InsufficientStock as exc:
+            product = next(product for product in products.values() if product.id == exc.product_id)
+            intake.reason = f"Insufficient stock: {product.uuid}"
+        except Exception:
+            logger.exception(f"Could not place order intake {intake.uuid}")
+            intake.reason = "Order could not be placed"
+    intake.status = OrderIntake.REJECTED
+    return False
+
+
+@shared_task
+def drain_order_intake(batch_size=None):
+    """
+    Place queued orders in micro-batches: every batch loads the products of
+    all its carts with one query and commits once, instead of one transaction
+    per order. Concurrent workers skip each other's locked intakes.
+    """
+    batch_size = batch_size or getattr(settings, "ORDER_INTAKE_BATCH_SIZE", 100)
+    placed = rejected = 0
+    while True:
+        with transaction.atomic():
+            intakes = list(
+                OrderIntake.objects.select_for_update(skip_locked=True, of=("self",))
+                .select_related("user")
+                .filter(status=OrderIntake.QUEUED)
+                .order_by("id")[:batch_size]
+            )
+            if not intakes:
+                break
+            products, _ = resolve_cart([
+                {"product_uuid": UUID(item["product_uuid"])} for intake in intakes for item in intake.items
+            ])
+            done, failed = [], []
+            for intake in intakes:
+                (done if place_intake(intake, products) else failed).append(intake)
+            OrderIntake.objects.filter(id__in=[intake.id for intake in done]).delete()
+            OrderIntake.objects.bulk_update(failed, ["status", "reason"])
+        placed += len(done)
+        rejected += len(failed)
+    return {"placed": placed, "rejected": rejected}
+
+
+@shared_task
+def update_sales_rollups():
+    """
+    Fold newly placed orders into the daily sales rollups.
+    """
+    return update_rollups()
+
+
+@shared_task
+def archive_old_orders():
+    """
+    Move orders older than ORDER_ARCHIVE_AFTER_DAYS to the archive tables.
+    """
+    return archive_orders()
+
+
+@shared_task
+def snapshot_top_sellers():
+    """
+    Refresh the cached top sellers snapshot that new processes start from.
+    """
+    return len(take_snapshot()["rows"])
@@ -1,3 +1,687 @@
-from django.test import TestCase
+import logging
+import threading
+from contextlib import redirect_stdout
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.core.models import Category, Product
+from apps.orders.archive import archive_orders
+from apps.orders.cache import order_detail_cache
+from apps.orders.inventory import create_order
+from apps.orders.leaderboard import Leaderboard, reset_leaderboard
+from apps.orders.models import (
+    ArchivedOrder,
+    DailyCategorySales,
+    DailyProductSales,
+    DailyUserSales,
+    Order,
+    OrderIntake,
+    OrderItem,
+    StockReservation,
+)
+from apps.orders.rollups import update_rollups
+from apps.orders.serializers import OrderSerializer, serialize_orders
+from apps.orders.tasks import drain_order_intake
+from apps.users.models import AppUser
+from utils.lru import LRUCache
+from ecommerce.celery import app as celery_app
+
+
+class SerializeOrdersTests(TestCase):
+    """
+    The values() fast path must render exactly what OrderSerializer renders.
+    """
+
+    def test_output_matches_order_serializer(self):
+        user = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        category = Category.objects.create(name="Books")
+        product = Product.objects.create(name="Novel", category=category, price="12.50", created_by=user)
+        order = Order.objects.create(user=user)
+        OrderItem.objects.create(order=order, product=product, quantity=2, price_at_order=product.price)
+        OrderItem.objects.create(order=order, product=product, quantity=1, price_at_order="9.99")
+        Order.objects.create(user=user)
+
+        orders = Order.objects.filter(user=user).order_by("id")
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(serialize_orders(orders)),
+            renderer.render(OrderSerializer(orders.prefetch_related("items__product"), many=True).data),
+        )
+
+
+class ConcurrentCheckoutTests(TransactionTestCase):
+    """
+    Concurrent checkouts of the same product must never oversell its stock.
+    """
+    initial_stock = 5
+    buyers = 12
+    max_attempts = 200
+
+    def test_stock_is_never_oversold(self):
+        category = Category.objects.create(name="Games")
+        seller = AppUser.objects.create_user(email="seller@example.com", password="Passw0rd!", first_name="Seller")
+        product = Product.objects.create(
+            name="Console", category=category, price="299.00", stock=self.initial_stock, created_by=seller
+        )
+        users = [
+            AppUser.objects.create_user(email=f"buyer{i}@example.com", password="Passw0rd!", first_name="Buyer")
+            for i in range(self.buyers)
+        ]
+        payload = {"items": [{"product_uuid": str(product.uuid), "quantity": 1}]}
+        barrier = threading.Barrier(self.buyers)
+        responses = []
+
+        def checkout(user):
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(user)
+            try:
+                barrier.wait()
+                for _ in range(self.max_attempts):
+                    response = client.post("/orders/create/", payload, format="json")
+                    # SQLite rejects concurrent writers with "table is locked"
+                    # instead of queueing them. Those requests surface as 500s
+                    # after their transaction rolled back, so they are retried.
+                    if response.status_code != 500:
+                        break
+                responses.append(response)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=checkout, args=(user,)) for user in users]
+        request_logger = logging.getLogger("django.request")
+        request_logger.disabled = True
+        try:
+            # The exception handler prints the traceback of every retried 500.
+            with redirect_stdout(StringIO()):
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            request_logger.disabled = False
+
+        product.refresh_from_db()
+        statuses = sorted(response.status_code for response in responses)
+        self.assertEqual(statuses, [200] * self.initial_stock + [400] * (self.buyers - self.initial_stock))
+        self.assertEqual(
+            {response.json()["message"] for response in responses if response.status_code == 400},
+            {"Insufficient stock"},
+        )
+        self.assertEqual(product.stock, 0)
+        self.assertEqual(Order.objects.count(), self.initial_stock)
+        self.assertEqual(OrderItem.objects.count(), self.initial_stock)
+
+
+class IdempotentOrderCreationTests(TestCase):
+    """
+    Retries carrying the same Idempotency-Key must not place another order.
+    """
+
+    def setUp(self):
+        self.user = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        category = Category.objects.create(name="Books")
+        self.product = Product.objects.create(
+            name="Novel", category=category, price="12.50", stock=10, created_by=self.user
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def place(self, quantity, key="checkout-1"):
+        payload = {"items": [{"product_uuid": str(self.product.uuid), "quantity": quantity}]}
+        return self.client.post("/orders/create/", payload, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_stored_response(self):
+        first = self.place(2)
+        retry = self.place(2)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.content, first.rendered_content)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 8)
+
+    def test_key_reused_with_different_payload_is_rejected(self):
+        self.place(2)
+        response = self.place(3)
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_distinct_keys_place_distinct_orders(self):
+        self.place(1, key="checkout-1")
+        self.place(1, key="checkout-2")
+
+        self.assertEqual(Order.objects.count(), 2)
+
+
+class MissingProductsTests(TestCase):
+    """
+    Carts naming unknown products are rejected before any stock is taken.
+    """
+
+    def setUp(self):
+        self.user = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        category = Category.objects.create(name="Books")
+        self.product = Product.objects.create(
+            name="Novel", category=category, price="12.50", stock=10, created_by=self.user
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_missing_products_are_listed(self):
+        missing = ["00000000-0000-0000-0000-000000000001", "00000000-0000-0000-0000-000000000002"]
+        items = [
+            {"product_uuid": missing[0], "quantity": 1},
+            {"product_uuid": str(self.product.uuid), "quantity": 2},
+            {"product_uuid": missing[1], "quantity": 1},
+            {"product_uuid": missing[0], "quantity": 1},
+        ]
+        for url in ("/orders/create/", "/orders/reservations/"):
+            with self.subTest(url=url):
+                response = self.client.post(url, {"items": items}, format="json")
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["message"], "One or more products not found")
+                self.assertEqual(response.json()["data"], {"missing_products": missing})
+
+        self.assertEqual(Order.objects.count(), 0)
+        self.assertFalse(StockReservation.objects.exists())
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 10)
+
+
+class OrderTotalsTests(TestCase):
+    """
+    Order totals are stored when an order is placed and can be backfilled.
+    """
+
+    def setUp(self):
+        self.user = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        category = Category.objects.create(name="Books")
+        self.novel = Product.objects.create(name="Novel", category=category, price="12.50", stock=10, created_by=self.user)
+        self.atlas = Product.objects.create(name="Atlas", category=category, price="30.00", stock=10, created_by=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_totals_are_stored_at_creation(self):
+        self.client.post("/orders/create/", {"items": [
+            {"product_uuid": str(self.novel.uuid), "quantity": 2},
+            {"product_uuid": str(self.atlas.uuid), "quantity": 1},
+        ]}, format="json")
+
+        order = Order.objects.get()
+        self.assertEqual(order.total_amount, Decimal("55.00"))
+        self.assertEqual(order.item_count, 3)
+
+    def test_backfill_recomputes_totals_in_chunks(self):
+        orders = [Order.objects.create(user=self.user) for _ in range(3)]
+        for order in orders:
+            OrderItem.objects.create(order=order, product=self.novel, quantity=3, price_at_order="9.99")
+        empty = Order.objects.create(user=self.user, total_amount="1.00", item_count=1)
+
+        call_command("backfill_order_totals", chunk_size=2, stdout=StringIO())
+
+        for order in orders:
+            order.refresh_from_db()
+            self.assertEqual((order.total_amount, order.item_count), (Decimal("29.97"), 3))
+        empty.refresh_from_db()
+        self.assertEqual((empty.total_amount, empty.item_count), (Decimal("0.00"), 0))
+
+    def test_summary_list_skips_items(self):
+        Order.objects.create(user=self.user, total_amount="12.50", item_count=1)
+
+        response = self.client.get("/orders/?view=summary")
+
+        self.assertEqual(response.json()["data"][0]["total_amount"], "12.50")
+        self.assertNotIn("items", response.json()["data"][0])
+
+
+class OrderHistoryTests(TestCase):
+    """
+    Order history is keyset paginated, newest first, over Order(user, created_at).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        other = AppUser.objects.create_user(email="other@example.com", password="Passw0rd!", first_name="Other")
+        cls.orders = [Order.objects.create(user=cls.user) for _ in range(5)]
+        Order.objects.create(user=other)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_pages_walk_history_newest_first(self):
+        seen = []
+        url = "/orders/?page_size=2&view=summary"
+        while url:
+            body = self.client.get(url).json()
+            seen.extend(order["uuid"] for order in body["data"])
+            cursor = body["pagination"]["next"]
+            url = f"/orders/?page_size=2&view=summary&cursor={cursor}" if cursor else None
+
+        self.assertEqual(seen, [str(order.uuid) for order in reversed(self.orders)])
+
+    def test_invalid_view_is_rejected(self):
+        self.assertEqual(self.client.get("/orders/?view=everything").status_code, 400)
+
+    def test_history_page_uses_user_index(self):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+        queryset = Order.objects.filter(user=self.user).order_by("-created_at", "-id")[:50]
+        plan = queryset.explain()
+        self.assertIn("order_user_created_idx", plan, msg=plan)
+
+
+@override_settings(ORDER_ASYNC_INTAKE=True, ORDER_INTAKE_BATCH_SIZE=2)
+class AsyncOrderIntakeTests(TestCase):
+    """
+    Queued orders are accepted with a 202 and placed by the intake worker,
+    run here in Celery's eager mode.
+    """
+
+    def setUp(self):
+        self.user = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        category = Category.objects.create(name="Books")
+        self.product = Product.objects.create(name="Novel", category=category, price="12.50", stock=3, created_by=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, "task_always_eager", False)
+
+    def order(self, quantity):
+        payload = {"items": [{"product_uuid": str(self.product.uuid), "quantity": quantity}]}
+        return self.client.post("/orders/create/", payload, format="json")
+
+    def test_orders_are_accepted_then_placed(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            accepted = [self.order(1) for _ in range(3)]
+        self.assertEqual([response.status_code for response in accepted], [202] * 3)
+        uuid = accepted[0].json()["data"]["uuid"]
+        self.assertEqual(self.client.get(f"/orders/{uuid}/").status_code, 202)
+        self.assertEqual(Order.objects.count(), 0)
+
+        callbacks[0]()
+
+        self.assertEqual(self.client.get(f"/orders/{uuid}/").status_code, 200)
+        self.assertEqual(Order.objects.count(), 3)
+        self.assertFalse(OrderIntake.objects.exists())
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 0)
+
+    def test_order_without_stock_is_rejected(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            uuid = self.order(5).json()["data"]["uuid"]
+
+        response = self.client.get(f"/orders/{uuid}/")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["data"]["status"], "rejected")
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_failing_intake_does_not_roll_back_its_batch(self):
+        with self.captureOnCommitCallbacks():
+            uuids = [self.order(1).json()["data"]["uuid"] for _ in range(3)]
+        calls = []
+
+        def flaky_create_order(*args, **kwargs):
+            calls.append(kwargs["uuid"])
+            if len(calls) == 2:
+                raise RuntimeError("Lost connection")
+            return create_order(*args, **kwargs)
+
+        with mock.patch("apps.orders.tasks.create_order", side_effect=flaky_create_order), \
+                self.assertLogs("apps.orders.tasks", "ERROR"):
+            self.assertEqual(drain_order_intake(), {"placed": 2, "rejected": 1})
+
+        self.assertEqual([self.client.get(f"/orders/{uuid}/").status_code for uuid in uuids], [200, 409, 200])
+        intake = OrderIntake.objects.get()
+        self.assertEqual((intake.status, intake.reason), (OrderIntake.REJECTED, "Order could not be placed"))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 1)
+
+
+@override_settings(ORDER_ASYNC_INTAKE=True)
+class IntakeBrokerOutageTests(TransactionTestCase):
+    """
+    A failing broker must not fail an order whose intake is already saved.
+    Runs in autocommit, where on_commit callbacks run inside the request.
+    """
+
+    def test_order_is_accepted_when_the_drain_cannot_be_queued(self):
+        user = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        category = Category.objects.create(name="Books")
+        product = Product.objects.create(name="Novel", category=category, price="12.50", stock=3, created_by=user)
+        client = APIClient()
+        client.force_authenticate(user)
+        payload = {"items": [{"product_uuid": str(product.uuid), "quantity": 1}]}
+
+        with mock.patch(
+            "apps.orders.views.drain_order_intake.delay", side_effect=ConnectionError("Broker unavailable")
+        ), self.assertLogs("django.db.backends.base", "ERROR"):
+            response = client.post("/orders/create/", payload, format="json")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(OrderIntake.objects.count(), 1)
+        self.assertEqual(str(OrderIntake.objects.get().uuid), response.json()["data"]["uuid"])
+
+
+class SalesRollupTests(TransactionTestCase):
+    """
+    Incremental rollups and a parallel rebuild must agree with the order items.
+    """
+
+    def setUp(self):
+        self.admin = AppUser.objects.create_user(
+            email="admin@example.com", password="Passw0rd!", first_name="Admin", role="admin"
+        )
+        self.buyer = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        books = Category.objects.create(name="Books")
+        self.novel = Product.objects.create(name="Novel", category=books, price=Decimal("10.00"), created_by=self.admin)
+        self.atlas = Product.objects.create(name="Atlas", category=books, price=Decimal("25.00"), created_by=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def place(self, *lines):
+        order = create_order(self.buyer, [
+            OrderItem(product=product, quantity=quantity, price_at_order=product.price)
+            for product, quantity in lines
+        ])
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(hours=1))
+        return order
+
+    def rollup_rows(self):
+        return [
+            sorted(model.objects.values_list("day", "quantity", "revenue", "order_count"))
+            for model in (DailyProductSales, DailyCategorySales, DailyUserSales)
+        ]
+
+    def test_incremental_updates_only_process_new_orders(self):
+        self.place((self.novel, 2), (self.atlas, 1))
+        self.place((self.novel, 1))
+        self.assertEqual(update_rollups(batch_size=1), 2)
+        self.place((self.atlas, 2))
+        self.assertEqual(update_rollups(batch_size=1), 1)
+        self.assertEqual(update_rollups(), 0)
+
+        report = self.client.get("/orders/reports/sales/?dimension=product").json()["data"]
+        self.assertEqual(
+            [(row["name"], row["quantity"], row["revenue"], row["order_count"]) for row in report],
+            [("Atlas", 3, "75.00", 2), ("Novel", 3, "30.00", 2)],
+        )
+        day = self.client.get("/orders/reports/sales/?dimension=day").json()["data"]
+        self.assertEqual([(row["quantity"], row["revenue"], row["order_count"]) for row in day], [(6, "105.00", 3)])
+
+    def test_report_requires_admin_or_staff(self):
+        self.assertEqual(APIClient().get("/orders/reports/sales/").status_code, 401)
+        client = APIClient()
+        client.force_authenticate(self.buyer)
+        self.assertEqual(client.get("/orders/reports/sales/").status_code, 403)
+
+    def test_rebuild_matches_incremental_rollups(self):
+        for quantity in range(1, 6):
+            self.place((self.novel, quantity), (self.atlas, 1))
+        update_rollups(batch_size=2)
+        incremental = self.rollup_rows()
+
+        call_command("rebuild_sales_rollups", chunk_size=2, workers=2, stdout=StringIO())
+
+        self.assertEqual(self.rollup_rows(), incremental)
+        self.place((self.novel, 1))
+        self.assertEqual(update_rollups(), 1)
+
+    def test_orders_inside_the_lag_window_are_not_folded(self):
+        recent = self.place((self.atlas, 1))
+        Order.objects.filter(pk=recent.pk).update(created_at=timezone.now())
+        self.place((self.novel, 1))
+        # The older order has the higher id; folding it would pass the recent one.
+        self.assertEqual(update_rollups(), 0)
+        self.assertEqual(self.rollup_rows(), [[], [], []])
+
+        Order.objects.filter(pk=recent.pk).update(created_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(update_rollups(), 2)
+        self.assertEqual(
+            sorted(DailyProductSales.objects.values_list("product_id", "quantity")),
+            sorted([(self.novel.id, 1), (self.atlas.id, 1)]),
+        )
+
+
+class OrderArchiveTests(TestCase):
+    """
+    Old orders move to the archive in resumable batches and stay readable.
+    """
+
+    def setUp(self):
+        self.user = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        category = Category.objects.create(name="Books")
+        product = Product.objects.create(name="Novel", category=category, price=Decimal("12.50"), created_by=self.user)
+        self.orders = []
+        for age in (400, 380, 2, 1):
+            order = create_order(self.user, [OrderItem(product=product, quantity=2, price_at_order=product.price)])
+            Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(days=age))
+            self.orders.append(order)
+        update_rollups()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_archives_in_resumable_batches(self):
+        self.assertEqual(archive_orders(older_than_days=365, batch_size=1, max_batches=1), 1)
+        self.assertEqual(archive_orders(older_than_days=365, batch_size=1), 1)
+        self.assertEqual(archive_orders(older_than_days=365), 0)
+
+        self.assertEqual(
+            set(ArchivedOrder.objects.values_list("uuid", flat=True)), {self.orders[0].uuid, self.orders[1].uuid}
+        )
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(OrderItem.objects.count(), 2)
+
+    def test_reads_fall_back_to_archive(self):
+        archive_orders(older_than_days=365)
+
+        response = self.client.get(f"/orders/{self.orders[0].uuid}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["total_amount"], "25.00")
+        self.assertEqual(len(response.json()["data"]["items"]), 1)
+
+        self.assertEqual(self.walk_history(page_size=3), [str(order.uuid) for order in reversed(self.orders)])
+
+    def test_full_hot_page_continues_into_archive(self):
+        archive_orders(older_than_days=365)
+
+        # The two hot orders exactly fill the first page.
+        self.assertEqual(self.walk_history(page_size=2), [str(order.uuid) for order in reversed(self.orders)])
+
+    def walk_history(self, page_size):
+        seen = []
+        url = f"/orders/?page_size={page_size}"
+        while url:
+            body = self.client.get(url).json()
+            seen.extend(order["uuid"] for order in body["data"])
+            cursor = body["pagination"]["next"]
+            url = f"/orders/?page_size={page_size}&cursor={cursor}" if cursor else None
+        return seen
+
+
+class LeaderboardTests(TestCase):
+    """
+    The sorted rankings must match a full sort after arbitrary updates.
+    """
+
+    def test_rankings_stay_sorted(self):
+        leaderboard = Leaderboard()
+        leaderboard.load([[1, 10, 5], [2, 10, 7], [3, 20, 1]], timezone.now())
+        leaderboard.set(3, 20, 9)
+        leaderboard.set(1, 20, 8)
+
+        self.assertEqual(leaderboard.top(10), [(3, 9), (1, 8), (2, 7)])
+        self.assertEqual(leaderboard.top(1, category_id=20), [(3, 9)])
+        self.assertEqual(leaderboard.top(10, category_id=10), [(2, 7)])
+
+
+class TopSellersTests(TransactionTestCase):
+    """
+    Concurrent orders must all be counted, and other processes' sales must
+    reach a leaderboard built from an older snapshot.
+    """
+
+    def setUp(self):
+        cache.clear()
+        reset_leaderboard()
+        self.addCleanup(reset_leaderboard)
+        self.user = AppUser.objects.create_user(email="buyer@example.com", password="Passw0rd!", first_name="Buyer")
+        self.books = Category.objects.create(name="Books")
+        games = Category.objects.create(name="Games")
+        self.novel = Product.objects.create(
+            name="Novel", category=self.books, price=Decimal("10.00"), stock=1000, created_by=self.user
+        )
+        self.atlas = Product.objects.create(
+            name="Atlas", category=self.books, price=Decimal("20.00"), stock=1000, created_by=self.user
+        )
+        self.chess = Product.objects.create(
+            name="Chess", category=games, price=Decimal("30.00"), stock=1000, created_by=self.user
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def top_sellers(self, query=""):
+        return [(row["name"], row["units_sold"]) for row in self.client.get(f"/orders/top-sellers/{query}").json()["data"]]
+
+    def test_counts_concurrent_orders_exactly(self):
+        def place():
+            try:
+                for _ in range(5):
+                    while True:
+                        try:
+                            with transaction.atomic():
+                                create_order(self.user, [OrderItem(product=self.novel, quantity=1, price_at_order=self.novel.price)])
+                            break
+                        except OperationalError:
+                            # SQLite rejects concurrent writers instead of queueing them.
+                            continue
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=place) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.top_sellers(), [("Novel", 20)])
+
+    def test_leaderboard_picks_up_new_sales(self):
+        create_order(self.user, [OrderItem(product=self.atlas, quantity=3, price_at_order=self.atlas.price)])
+        self.assertEqual(self.top_sellers(), [("Atlas", 3)])
+
+        create_order(self.user, [
+            OrderItem(product=self.novel, quantity=4, price_at_order=self.novel.price),
+            OrderItem(product=self.chess, quantity=2, price_at_order=self.chess.price),
+        ])
+        self.assertEqual(self.top_sellers(), [("Novel", 4), ("Atlas", 3), ("Chess", 2)])
+        self.assertEqual(self.top_sellers(f"?category={self.books.uuid}&limit=1"), [("Novel", 4)])
+
+        reset_leaderboard()
+        self.assertEqual(self.top_sellers("?limit=2"), [("Novel", 4), ("Atlas", 3)])
+
+    def test_product_moved_to_another_category_is_reranked(self):
+        create_order(self.user, [OrderItem(product=self.atlas, quantity=3, price_at_order=self.atlas.price)])
+        self.assertEqual(self.top_sellers(f"?category={self.books.uuid}"), [("Atlas", 3)])
+
+        self.atlas.category = self.chess.category
+        self.atlas.save()
+
+        self.assertEqual(self.top_sellers(f"?category={self.books.uuid}"), [])
+        self.assertEqual(self.top_sellers(f"?category={self.chess.category.uuid}"), [("Atlas", 3)])
+
+
+class OrderDetailCacheTests(TestCase):
+    """
+    Rendered order details are served from the LRU cache, only to their owner.
+    """
+
+    def setUp(self):
+        order_detail_cache.clear()
+        self.addCleanup(order_detail_cache.clear)
+        self.owner = AppUser.objects.create_user(email="owner@example.com", password="Passw0rd!", first_name="Owner")
+        self.other = AppUser.objects.create_user(email="other@example.com", password="Passw0rd!", first_name="Other")
+        category = Category.objects.create(name="Books")
+        self.product = Product.objects.create(
+            name="Novel", category=category, price=Decimal("12.50"), created_by=self.owner
+        )
+        self.order = create_order(self.owner, [OrderItem(product=self.product, quantity=2, price_at_order=self.product.price)])
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_repeated_reads_skip_the_database(self):
+        client = self.client_for(self.owner)
+        first = client.get(f"/orders/{self.order.uuid}/")
+
+        with self.assertNumQueries(0):
+            second = client.get(f"/orders/{self.order.uuid}/")
+            not_modified = client.get(f"/orders/{self.order.uuid}/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_cached_order_is_not_served_to_other_users(self):
+        self.client_for(self.owner).get(f"/orders/{self.order.uuid}/")
+
+        response = self.client_for(self.other).get(f"/orders/{self.order.uuid}/")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_product_changes_invalidate_cached_details(self):
+        client = self.client_for(self.owner)
+        client.get(f"/orders/{self.order.uuid}/")
+
+        self.product.name = "Novel, 2nd edition"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+        items = client.get(f"/orders/{self.order.uuid}/").json()["data"]["items"]
+        self.assertEqual([item["product_name"] for item in items], ["Novel, 2nd edition"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.delete()
+        self.assertEqual(client.get(f"/orders/{self.order.uuid}/").json()["data"]["items"], [])
+
+    def test_product_rename_changes_the_etag(self):
+        client = self.client_for(self.owner)
+        etag = client.get(f"/orders/{self.order.uuid}/")["ETag"]
+
+        self.product.name = "Novel, 2nd edition"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+        for _ in range(2):
+            # Uncached, then cached.
+            response = client.get(f"/orders/{self.order.uuid}/", HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response["ETag"], etag)
+            self.assertEqual(response.json()["data"]["items"][0]["product_name"], "Novel, 2nd edition")
+
+    def test_lru_evicts_least_recently_used_within_byte_budget(self):
+        lru = LRUCache(max_entries=10, max_bytes=10)
+        lru.set("a", b"1234")
+        lru.set("b", b"1234")
+        lru.get("a")
+        lru.set("c", b"1234")
+
+        self.assertEqual((lru.get("a"), lru.get("b"), lru.get("c")), (b"1234", None, b"1234"))
+        self.assertEqual(lru.size, 8)
+        lru.set("huge", b"x" * 11)
+        self.assertIsNone(lru.get("huge"))
@@ -1,8 +1,20 @@
 from django.urls import path
-from apps.orders.views import CreateOrderView, OrderListView, OrderDetailView
+from apps.orders.views import (
+    CreateOrderView,
+    OrderListView,
+    OrderDetailView,
+    StockReservationView,
+    StockReservationDetailView,
+    SalesReportView,
+    TopSellersView,
+)
 
 urlpatterns = [
     path("create/", CreateOrderView.as_view(), name="create-order"),
     path('', OrderListView.as_view(), name='order-list'),
     path('<uuid:uuid>/', OrderDetailView.as_view(), name='order-detail'),
+    path('reports/sales/', SalesReportView.as_view(), name='sales-report'),
+    path('top-sellers/', TopSellersView.as_view(), name='top-sellers'),
+    path('reservations/', StockReservationView.as_view(), name='stock-reservation'),
+    path('reservations/<uuid:uuid>/', StockReservationDetailView.as_view(), name='stock-reservation-detail'),
 ]
@@ -1,61 +1,373 @@
+from datetime import timedelta
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import transaction
-from apps.orders.models import Order, OrderItem
-from apps.core.models import Product
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from apps.orders.models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    Order,
+    OrderIntake,
+    OrderItem,
+    StockReservation,
+    StockReservationItem,
+)
+from apps.orders.idempotency import idempotent
+from apps.orders.tasks import drain_order_intake
+from apps.orders.inventory import (
+    InsufficientStock,
+    cart_quantities,
+    create_order,
+    release_reservations,
+    reserve_stock,
+    resolve_cart,
+)
+from django.utils.dateparse import parse_date
+from apps.orders.cache import cache_order_detail, get_cached_order_detail, get_order_detail_version
+from apps.orders.leaderboard import get_leaderboard
+from apps.orders.rollups import REPORT_DIMENSIONS, sales_report
+from apps.core.models import Category, Product
 from utils.mixins import ResponseViewMixin
-from apps.orders.serializers import OrderCreateSerializer, OrderSerializer, OrderItemSerializer
+from utils.permissions import IsAdminOrStaff
+from utils.pagination import KeysetPaginator, InvalidCursor
+from apps.orders.serializers import (
+    ArchivedOrderSerializer,
+    OrderCreateSerializer,
+    OrderSerializer,
+    OrderItemSerializer,
+    StockReservationCreateSerializer,
+    order_values_serializer,
+    serialize_order_rows,
+)
 
-class CreateOrderView(APIView, ResponseViewMixin):
+
+class StockResponseMixin(object):
+
+    def insufficient_stock_response(self, exc, products):
+        """
+        400 naming the product of ``products`` that ran out of stock.
+        """
+        product = next(product for product in products.values() if product.id == exc.product_id)
+        return self.error_response(message="Insufficient stock", data={"product": str(product.uuid)})
+
+
+class CreateOrderView(APIView, ResponseViewMixin, StockResponseMixin):
     """
     CreateOrderView handles the creation of orders by authenticated users.
+
+    All products of the cart are loaded with one query inside the write
+    transaction, so prices and stock are read together, and the order items
+    are inserted with a single bulk_create. Stock is taken with conditional updates inside the same
+    transaction, so an order either gets all of its stock or none of it.
+    Passing ``reservation`` instead of ``items`` checks out stock that was
+    reserved earlier through StockReservationView.
+
+    Requests carrying an ``Idempotency-Key`` header are placed at most once;
+    retries get the stored response of the first attempt.
+
+    With ``ORDER_ASYNC_INTAKE`` enabled, item orders are only validated and
+    queued; the response is a 202 with the uuid the order will get, to be
+    polled at OrderDetailView while ``drain_order_intake`` places it.
     """
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def post(self, request):
         serializer = OrderCreateSerializer(data=request.data)
         if not serializer.is_valid():
             return self.error_response(data=serializer.errors, message="Validation failed")
+        if "reservation" in serializer.validated_data:
+            return self.checkout_reservation(request, serializer)
+        if getattr(settings, "ORDER_ASYNC_INTAKE", False):
+            return self.enqueue_order(request, serializer)
 
+        items = serializer.validated_data["items"]
         try:
             with transaction.atomic():
-                order = Order.objects.create(user=request.user)
-
-                for item in serializer.validated_data["items"]:
-                    product = Product.objects.get(uuid=item["product_uuid"])
-                    OrderItem.objects.create(
-                        order=order,
-                        product=product,
+                products, missing = resolve_cart(items)
+                if missing:
+                    return self.error_response(
+                        message="One or more products not found", data={"missing_products": missing}
+                    )
+                reserve_stock(cart_quantities(items, products))
+                create_order(request.user, [
+                    OrderItem(
+                        product=products[item["product_uuid"]],
                         quantity=item["quantity"],
-                        price_at_order=product.price
+                        price_at_order=products[item["product_uuid"]].price
                     )
+                    for item in items
+                ])
+        except InsufficientStock as exc:
+            return self.insufficient_stock_response(exc, products)
+
+        return self.success_response(message="Order placed successfully", data=serializer.data)
+
+    def enqueue_order(self, request, serializer):
+        intake = OrderIntake.objects.create(
+            user=request.user,
+            items=[
+                {"product_uuid": str(item["product_uuid"]), "quantity": item["quantity"]}
+                for item in serializer.validated_data["items"]
+            ],
+        )
+        # The intake is saved either way; if the broker is down the periodic
+        # drain picks it up, so the client must still get its 202.
+        transaction.on_commit(lambda: drain_order_intake.delay(), robust=True)
+        return self.success_response(
+            code=status.HTTP_202_ACCEPTED,
+            message="Order accepted for processing",
+            data={"uuid": str(intake.uuid), "status": intake.status},
+        )
 
-        except Product.DoesNotExist:
-            return self.error_response(message="One or more products not found")
+    def checkout_reservation(self, request, serializer):
+        with transaction.atomic():
+            reservation = StockReservation.objects.select_for_update().filter(
+                uuid=serializer.validated_data["reservation"],
+                user=request.user,
+                expires_at__gt=timezone.now(),
+            ).first()
+            if reservation is None:
+                return self.error_response(message="Reservation not found or expired", code=404)
+            create_order(request.user, [
+                OrderItem(
+                    product=item.product,
+                    quantity=item.quantity,
+                    price_at_order=item.product.price
+                )
+                for item in reservation.items.select_related("product")
+            ])
+            reservation.delete()
 
         return self.success_response(message="Order placed successfully", data=serializer.data)
-    
+
+
+class StockReservationView(APIView, ResponseViewMixin, StockResponseMixin):
+    """
+    StockReservationView reserves stock for a cart of the authenticated user.
+
+    The stock is taken immediately and held until the reservation is checked
+    out through CreateOrderView, released, or expires after
+    STOCK_RESERVATION_TTL seconds (see ``release_expired_reservations``).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = StockReservationCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.error_response(data=serializer.errors, message="Validation failed")
+
+        items = serializer.validated_data["items"]
+        expires_at = timezone.now() + timedelta(seconds=settings.STOCK_RESERVATION_TTL)
+        try:
+            with transaction.atomic():
+                products, missing = resolve_cart(items)
+                if missing:
+                    return self.error_response(
+                        message="One or more products not found", data={"missing_products": missing}
+                    )
+                quantities = cart_quantities(items, products)
+                reserve_stock(quantities)
+                reservation = StockReservation.objects.create(user=request.user, expires_at=expires_at)
+                StockReservationItem.objects.bulk_create([
+                    StockReservationItem(reservation=reservation, product_id=product_id, quantity=quantity)
+                    for product_id, quantity in quantities.items()
+                ])
+        except InsufficientStock as exc:
+            return self.insufficient_stock_response(exc, products)
+
+        return self.success_response(
+            message="Stock reserved",
+            data={"uuid": str(reservation.uuid), "expires_at": reservation.expires_at},
+        )
+
+
+class StockReservationDetailView(APIView, ResponseViewMixin):
+    """
+    StockReservationDetailView releases a reservation of the authenticated user early.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request, uuid):
+        with transaction.atomic():
+            reservation = StockReservation.objects.select_for_update().filter(
+                uuid=uuid, user=request.user
+            ).first()
+            if reservation is None:
+                return self.error_response(message="Reservation not found", code=404)
+            release_reservations([reservation.id])
+        return self.success_response(message="Reservation released")
+
+
 class OrderListView(APIView, ResponseViewMixin):
     """
     OrderListView handles fetching and returning a list of orders for the authenticated user.
+
+    Orders are returned newest first and keyset paginated on (created_at, id);
+    pass the ``next`` cursor from the response envelope as ``?cursor=`` to
+    fetch older orders. With ``?view=summary`` only the order headers and
+    their stored totals are returned, without loading any items.
+
+    Archived orders are older than every order left in the hot table, so once
+    the hot orders run out a page continues seamlessly into the archive.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        orders = Order.objects.filter(user=request.user).prefetch_related("items__product")
-        serializer = OrderSerializer(orders, many=True)
-        return self.success_response(data=serializer.data, message="Orders fetched")
-    
+        view = request.query_params.get("view", "full")
+        if view not in ("full", "summary"):
+            return self.error_response(message="Invalid view, expected full or summary")
+        paginator = KeysetPaginator(descending=True)
+        lookups = ["id", *order_values_serializer.lookups]
+        try:
+            rows, pagination = paginator.paginate(
+                Order.objects.filter(user=request.user).values(*lookups), request
+            )
+            archived_rows = []
+            page_size = pagination["page_size"]
+            if not pagination["has_next"]:
+                cursor = paginator.encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if rows else None
+                archived = ArchivedOrder.objects.filter(user=request.user).values(*lookups)
+                if len(rows) < page_size:
+                    archived_rows, pagination = paginator.paginate(
+                        archived, request, cursor=cursor, page_size=page_size - len(rows)
+                    )
+                    pagination.update(page_size=page_size, count=len(rows) + len(archived_rows))
+                elif paginator.paginate(archived, request, cursor=cursor, page_size=1)[0]:
+                    # The hot orders exactly filled this page; the next one
+                    # starts in the archive.
+                    pagination.update(next=cursor, has_next=True)
+        except InvalidCursor:
+            return self.error_response(message="Invalid cursor")
+        if view == "summary":
+            data = order_values_serializer.serialize_rows(rows + archived_rows)
+        else:
+            data = serialize_order_rows(rows) + serialize_order_rows(archived_rows, ArchivedOrderItem)
+        return self.paginated_response(data=data, message="Orders fetched", pagination=pagination)
+
+
 class OrderDetailView(APIView, ResponseViewMixin):
     """
     OrderDetailView handles retrieving the details of a specific order for an authenticated user.
+
+    Orders not found in the hot table are looked up in the archive, then in
+    the asynchronous intake.
+
+    The rendered response is kept in the in-process ``order_detail_cache``
+    after the first read, and later reads (including conditional ones) are
+    answered without touching the database until a product is renamed or
+    deleted (see ``apps.orders.cache``).
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, uuid):
+        version = get_order_detail_version()
+        cached = get_cached_order_detail(uuid, request.user.id, version)
+        if cached is not None:
+            etag, content = cached
+            response = self.not_modified_response(request, etag) or self.rendered_response(content)
+            response["ETag"] = etag
+            return response
+
+        for model, serializer_class in ((Order, OrderSerializer), (ArchivedOrder, ArchivedOrderSerializer)):
+            order = model.objects.filter(uuid=uuid, user=request.user).first()
+            if order is not None:
+                # The detail shows live product names, so the ETag changes
+                # with the version bumped when a product is renamed or deleted.
+                not_modified = self.evaluate_preconditions(request, order, version)
+                if not_modified:
+                    return not_modified
+                prefetch_related_objects([order], "items__product")
+                content = self.render_envelope(data=serializer_class(order).data, message="Order detail fetched")
+                etag = self.make_etag(order.uuid, order.updated_at, version)
+                cache_order_detail(order.uuid, order.user_id, etag, content, version)
+                response = self.rendered_response(content)
+                response["ETag"] = etag
+                return response
+        return self.intake_response(request, uuid)
+
+    def intake_response(self, request, uuid):
+        """
+        Status of an order still owned by the asynchronous intake.
+        """
+        intake = OrderIntake.objects.filter(uuid=uuid, user=request.user).first()
+        if intake is None:
+            return self.error_response(message="Order not found", code=404)
+        data = {"uuid": str(intake.uuid), "status": intake.status}
+        if intake.status == OrderIntake.REJECTED:
+            data["reason"] = intake.reason
+            return self.error_response(message="Order rejected", data=data, code=status.HTTP_409_CONFLICT)
+        return self.success_response(code=status.HTTP_202_ACCEPTED, message="Order is being processed", data=data)
+
+
+class SalesReportView(APIView, ResponseViewMixin):
+    """
+    SalesReportView serves sales dashboards from the daily rollup tables.
+
+    Query parameters:
+        dimension: ``product``, ``category``, ``user`` or ``day`` (default ``day``).
+        start_date / end_date: Inclusive ``YYYY-MM-DD`` bounds.
+        limit: Rows returned for non-day dimensions (default 50, at most 500).
+    """
+    permission_classes = [IsAuthenticated, IsAdminOrStaff]
+
+    def get(self, request):
+        dimension = request.query_params.get("dimension", "day")
+        if dimension not in REPORT_DIMENSIONS:
+            return self.error_response(message=f"Invalid dimension, expected one of {', '.join(REPORT_DIMENSIONS)}")
+        dates = {}
+        for param in ("start_date", "end_date"):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                dates[param] = parse_date(value)
+            except ValueError:
+                dates[param] = None
+            if dates[param] is None:
+                return self.error_response(message=f"Invalid {param}")
         try:
-            order = Order.objects.prefetch_related("items__product").get(uuid=uuid, user=request.user)
-        except Order.DoesNotExist:
-            return self.error_response(message="Order not found", status_code=404)
-        serializer = OrderSerializer(order)
-        return self.success_response(data=serializer.data, message="Order detail fetched")
+            limit = max(1, min(int(request.query_params.get("limit", 50)), 500))
+        except ValueError:
+            return self.error_response(message="Invalid limit")
+        return self.success_response(
+            data=sales_report(dimension, limit=limit, **dates), message="Sales report fetched"
+        )
+
+
+class TopSellersView(APIView, ResponseViewMixin):
+    """
+    TopSellersView returns the best selling products, overall or within
+    ``?category=<uuid>``, served from the in-process leaderboard.
+    ``?limit=`` caps the rows returned (default 10, at most 100).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 10)), 100))
+        except ValueError:
+            return self.error_response(message="Invalid limit")
+        category_id = None
+        category_uuid = request.query_params.get("category")
+        if category_uuid:
+            try:
+                category_id = Category.objects.values_list("id", flat=True).get(uuid=category_uuid)
+            except (Category.DoesNotExist, ValidationError):
+                return self.error_response(message="Category not found", code=404)
+
+        leaderboard = get_leaderboard()
+        top = leaderboard.top(limit, category_id)
+        products = Product.objects.only("id", "uuid", "name").in_bulk([product_id for product_id, _ in top])
+        data = []
+        for product_id, units_sold in top:
+            product = products.get(product_id)
+            if product is None:
+                leaderboard.discard(product_id)
+                continue
+            data.append({"uuid": str(product.uuid), "name": product.name, "units_sold": units_sold})
+        return self.success_response(data=data, message="Top sellers fetched")
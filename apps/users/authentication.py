@@ -0,0 +1,49 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.users.cache import get_cached_user
+from apps.users.revocation import is_token_revoked
+from apps.users.tokens import VERSION_CLAIM, get_token_version
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user through
+    ``apps.users.cache`` instead of querying AppUser on every request.
+
+    Tokens are still fully validated; only the user lookup is cached. With
+    ``CHECK_REVOKE_TOKEN`` enabled the password hash is needed, so lookups
+    go to the database as usual.
+
+    Tokens carrying a version claim older than the user's current token
+    version (see ``apps.users.tokens``) are rejected, so the role and active
+    claims the permission classes rely on are always current. Revoked tokens
+    (see ``apps.users.revocation``) are rejected as well.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_token_revoked(validated_token):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        version = validated_token.get(VERSION_CLAIM)
+        if version is not None and version != get_token_version(user_id):
+            raise AuthenticationFailed(_("Token is no longer valid"), code="token_stale")
+
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != "id":
+            return super().get_user(validated_token)
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.users.models import AppUser
+from utils.lru import LRUCache
+
+USER_CACHE_KEY = "users:auth:{user_id}"
+
+# The password hash is never cached; it stays a deferred field that is
+# loaded from the database only if something actually reads it.
+CACHED_USER_FIELDS = [field.attname for field in AppUser._meta.concrete_fields if field.attname != "password"]
+
+# Per-process layer in front of the shared cache: user_id -> (expires_at, values).
+_local_users = LRUCache(max_entries=getattr(settings, "AUTH_USER_LOCAL_CACHE_SIZE", 10000))
+
+
+def _build_user(values):
+    return AppUser.from_db("default", CACHED_USER_FIELDS, [values[field] for field in CACHED_USER_FIELDS])
+
+
+def get_cached_user(user_id):
+    """
+    Return the AppUser with primary key ``user_id``, or None if it does not exist.
+
+    Users are read from a short lived per-process cache, then the shared
+    cache, then the database. Every call returns a fresh instance, so request
+    handlers can never mutate an object shared with other requests.
+    """
+    entry = _local_users.get(user_id)
+    if entry is not None and entry[0] > time.monotonic():
+        return _build_user(entry[1])
+
+    key = USER_CACHE_KEY.format(user_id=user_id)
+    values = cache.get(key)
+    if values is None:
+        values = AppUser.objects.filter(pk=user_id).values(*CACHED_USER_FIELDS).first()
+        if values is None:
+            return None
+        cache.set(key, values, timeout=getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60 * 5))
+    _local_users.set(user_id, (time.monotonic() + getattr(settings, "AUTH_USER_LOCAL_CACHE_TTL", 5), values))
+    return _build_user(values)
+
+
+def invalidate_cached_user(user_id):
+    """
+    Drop ``user_id`` from the shared cache and this process's cache. Other
+    processes notice within AUTH_USER_LOCAL_CACHE_TTL seconds.
+    """
+    _local_users.delete(user_id)
+    cache.delete(USER_CACHE_KEY.format(user_id=user_id))
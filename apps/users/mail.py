@@ -0,0 +1,124 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from apps.users.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+
+def queue_email(subject, body, recipient):
+    """
+    Queue a plain text mail for the next flush_outgoing_emails run.
+    """
+    return OutgoingEmail.objects.create(subject=subject, body=body, recipient=recipient)
+
+
+def send_batch(emails, connection):
+    """
+    Send ``emails`` one message at a time over ``connection``, so a failure
+    only affects its own message. Returns ``(sent, failed, error)`` where
+    ``failed`` pairs each failed OutgoingEmail with its exception.
+
+    A connection that cannot be opened is not the fault of any message: the
+    batch stops there and ``error`` is that exception, with the remaining
+    mails in neither list.
+    """
+    sent, failed = [], []
+    for email in emails:
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email.recipient],
+            connection=connection,
+        )
+        try:
+            # No-op while the session is open; opened here, send_messages
+            # leaves the connection open for the next message.
+            connection.open()
+        except Exception as e:
+            connection.close()
+            return sent, failed, e
+        try:
+            connection.send_messages([message])
+        except Exception as e:
+            failed.append((email, e))
+            # The session may be broken; the next message reconnects.
+            connection.close()
+        else:
+            sent.append(email)
+    return sent, failed, None
+
+
+def claim_emails(now, last_id, batch_size, claim_timeout):
+    """
+    Claim the next batch of due mails by moving their next attempt past the
+    claim timeout, so no row lock has to be held while they are sent.
+    """
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutgoingEmail.QUEUED, next_attempt_at__lte=now, id__gt=last_id)
+            .order_by("id")[:batch_size]
+        )
+        OutgoingEmail.objects.filter(id__in=[email.id for email in emails]).update(
+            next_attempt_at=now + timedelta(seconds=claim_timeout)
+        )
+    return emails
+
+
+def flush_outgoing_emails(batch_size=None):
+    """
+    Send due queued mails in batches, reusing one SMTP connection for the
+    whole run instead of opening one per mail.
+
+    Each batch is claimed in one short transaction, sent without holding any
+    database locks, and its outcome recorded in a second one. Sent mails are
+    deleted. A failed mail is retried on a later run with exponential backoff
+    from EMAIL_RETRY_DELAY seconds, and marked failed after EMAIL_MAX_ATTEMPTS
+    attempts. When the mail server cannot be reached the run stops and the
+    mails left unsent are released without being charged an attempt.
+    """
+    batch_size = batch_size or getattr(settings, "EMAIL_BATCH_SIZE", 100)
+    max_attempts = getattr(settings, "EMAIL_MAX_ATTEMPTS", 5)
+    retry_delay = getattr(settings, "EMAIL_RETRY_DELAY", 60)
+    claim_timeout = getattr(settings, "EMAIL_CLAIM_TIMEOUT", 60 * 5)
+    delivered = failed_count = last_id = 0
+    now = timezone.now()
+    connection = get_connection(fail_silently=False)
+    try:
+        while True:
+            emails = claim_emails(now, last_id, batch_size, claim_timeout)
+            if not emails:
+                break
+            last_id = emails[-1].id
+            sent, failed, error = send_batch(emails, connection)
+            for email, exc in failed:
+                email.attempts += 1
+                email.last_error = str(exc)[:1000]
+                if email.attempts >= max_attempts:
+                    email.status = OutgoingEmail.FAILED
+                email.next_attempt_at = now + timedelta(seconds=retry_delay * 2 ** (email.attempts - 1))
+            done = {email.id for email in sent} | {email.id for email, _ in failed}
+            with transaction.atomic():
+                OutgoingEmail.objects.filter(id__in=[email.id for email in sent]).delete()
+                OutgoingEmail.objects.bulk_update(
+                    [email for email, _ in failed], ["attempts", "last_error", "status", "next_attempt_at"]
+                )
+                # Release the claim on mails the run did not get to.
+                OutgoingEmail.objects.filter(
+                    id__in=[email.id for email in emails if email.id not in done]
+                ).update(next_attempt_at=now)
+            delivered += len(sent)
+            failed_count += len(failed)
+            if error is not None:
+                logger.warning(f"Stopped flushing outgoing emails: {error}")
+                break
+    finally:
+        connection.close()
+    return {"sent": delivered, "failed": failed_count}
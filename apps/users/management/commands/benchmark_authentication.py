@@ -0,0 +1,64 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.authentication import CachedJWTAuthentication
+from apps.users.cache import invalidate_cached_user
+from apps.users.models import AppUser
+from utils.mixins import ResponseViewMixin
+from utils.permissions import IsAdminOrStaff
+
+
+class PingView(APIView, ResponseViewMixin):
+    permission_classes = [IsAdminOrStaff]
+
+    def get(self, request):
+        return self.success_response(message="pong")
+
+
+class Command(BaseCommand):
+    """
+    Compare requests/sec and queries per request of a minimal role protected
+    endpoint authenticated with JWTAuthentication and CachedJWTAuthentication.
+
+    Requests go through the real DRF stack with APIRequestFactory. The user is
+    created inside a transaction that is rolled back at the end.
+    """
+    help = "Benchmark JWT authentication with and without the user cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        count = options["requests"]
+        factory = APIRequestFactory()
+
+        with transaction.atomic():
+            user = AppUser.objects.create(
+                email=f"benchmark-{uuid.uuid4()}@example.com", first_name="Benchmark", role="staff"
+            )
+            header = f"Bearer {AccessToken.for_user(user)}"
+            self.stdout.write(f"{'authentication':>26} {'req/s':>10} {'queries/req':>12}")
+            for authentication_class in (JWTAuthentication, CachedJWTAuthentication):
+                invalidate_cached_user(user.pk)
+                view = PingView.as_view(authentication_classes=[authentication_class])
+                view(factory.get("/ping/", HTTP_AUTHORIZATION=header))
+
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for _ in range(count):
+                        response = view(factory.get("/ping/", HTTP_AUTHORIZATION=header))
+                        assert response.status_code == 200, response.data
+                    elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{authentication_class.__name__:>26} {count / elapsed:>10.0f} {len(queries) / count:>12.2f}"
+                )
+            invalidate_cached_user(user.pk)
+            transaction.set_rollback(True)
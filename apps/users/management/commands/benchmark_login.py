@@ -0,0 +1,97 @@
+import time
+import uuid
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+
+from apps.users.models import AppUser
+from apps.users.views import LoginView
+
+
+class Command(BaseCommand):
+    """
+    Load test the login endpoint during a credential stuffing burst.
+
+    Attackers spread wrong passwords over many emails from a handful of IPs
+    while legitimate users log in from their own IPs. The same traffic is
+    replayed against LoginView without throttling and with LoginThrottle,
+    reporting attempts/sec, password hashes computed and legitimate logins
+    that got through. Users are created inside a transaction that is rolled
+    back at the end; the cache is cleared before each run.
+    """
+    help = "Benchmark the login endpoint under a credential stuffing attack."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--attempts", type=int, default=120, help="Attacker login attempts.")
+        parser.add_argument("--attackers", type=int, default=2, help="Distinct attacker IPs.")
+        parser.add_argument("--users", type=int, default=10, help="Legitimate users logging in.")
+
+    def traffic(self, factory, emails, options):
+        """
+        Attack attempts with one legitimate login interleaved at even intervals.
+        """
+        users = options["users"]
+        every = max(1, options["attempts"] // users)
+        for i in range(options["attempts"]):
+            ip = f"203.0.113.{i % options['attackers']}"
+            yield False, factory.post(
+                "/users/login/", {"email": f"victim{i}@example.com", "password": "guess"},
+                format="json", REMOTE_ADDR=ip,
+            )
+            if i % every == 0 and i // every < users:
+                n = i // every
+                yield True, factory.post(
+                    "/users/login/", {"email": emails[n], "password": "Passw0rd!"},
+                    format="json", REMOTE_ADDR=f"198.51.100.{n}",
+                )
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        hashes = [0]
+        check_password = AppUser.check_password
+
+        def counting_check_password(user, raw_password):
+            hashes[0] += 1
+            return check_password(user, raw_password)
+
+        with transaction.atomic():
+            emails = []
+            for n in range(options["users"]):
+                user = AppUser.objects.create_user(
+                    email=f"benchmark-{uuid.uuid4()}@example.com", password="Passw0rd!", first_name="Benchmark"
+                )
+                emails.append(user.email)
+            AppUser.objects.bulk_create([
+                AppUser(email=f"victim{i}@example.com", first_name="Victim", password=user.password)
+                for i in range(options["attempts"])
+            ])
+
+            AppUser.check_password = counting_check_password
+            try:
+                self.stdout.write(
+                    f"{'login view':>12} {'req/s':>8} {'hashes':>8} {'throttled':>10} {'logged in':>10}"
+                )
+                for name, view in (
+                    ("unthrottled", LoginView.as_view(throttle_classes=[])),
+                    ("throttled", LoginView.as_view()),
+                ):
+                    cache.clear()
+                    hashes[0] = 0
+                    requests = list(self.traffic(factory, emails, options))
+                    throttled = logged_in = 0
+                    started = time.perf_counter()
+                    for legitimate, request in requests:
+                        response = view(request)
+                        throttled += response.status_code == 429
+                        logged_in += legitimate and response.status_code == 200
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"{name:>12} {len(requests) / elapsed:>8.1f} {hashes[0]:>8} {throttled:>10}"
+                        f" {logged_in:>6}/{options['users']:<3}"
+                    )
+            finally:
+                AppUser.check_password = check_password
+                cache.clear()
+            transaction.set_rollback(True)
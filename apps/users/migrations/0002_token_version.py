@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 18:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appuser',
+            name='token_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.db import models
 # Create your models here.
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.utils import timezone
 from apps.users.managers import CustomUserManager
 from utils.models import TimeStampModel
 import uuid
@@ -29,6 +30,9 @@ class AppUser(AbstractBaseUser, PermissionsMixin, TimeStampModel):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False) 
     is_superuser = models.BooleanField(default=False)
+    # Bumped whenever a claim embedded in issued tokens (role, active flag)
+    # or the password changes; tokens carrying an older version are rejected.
+    token_version = models.PositiveIntegerField(default=1)
 
     objects = CustomUserManager()
 
@@ -50,3 +54,44 @@ class AppUser(AbstractBaseUser, PermissionsMixin, TimeStampModel):
     @property
     def is_agent_user(self):
         return self.role == 'agent'
+
+
+class RevokedToken(models.Model):
+    """
+    Denylist of revoked JWTs, keyed by their ``jti`` claim. Rows are only
+    needed until the token would have expired anyway.
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+
+class OutgoingEmail(TimeStampModel):
+    """
+    OutgoingEmail is a queued mail waiting for the periodic flush, which sends
+    due mails in batches over one SMTP connection. Sent mails are deleted;
+    mails that keep failing are kept as failed, with the last error.
+    """
+    QUEUED = "queued"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (FAILED, "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    recipient = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outgoing_email_due_idx"),
+        ]
@@ -0,0 +1,101 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from apps.users.models import RevokedToken
+from utils.bloom import BloomFilter
+
+# Revocations committed slightly out of order are still picked up by the
+# next incremental sync as long as they commit within this window.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class RevocationFilter(object):
+    """
+    Per-process Bloom filter over the jtis in the RevokedToken table.
+
+    A miss means the token is certainly not revoked (as of the last sync), so
+    most requests are answered without leaving the process. The filter picks
+    up new revocations every TOKEN_REVOCATION_SYNC_INTERVAL seconds and is
+    rebuilt from the live rows every TOKEN_REVOCATION_REBUILD_INTERVAL
+    seconds, which drops the jtis of tokens that have expired since.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.synced_at = None
+        self.next_sync = 0
+        self.next_rebuild = 0
+
+    def _rebuild(self, now):
+        jtis = list(RevokedToken.objects.filter(expires_at__gt=now).values_list("jti", flat=True))
+        capacity = max(getattr(settings, "TOKEN_REVOCATION_FILTER_CAPACITY", 100000), 2 * len(jtis))
+        self.bloom = BloomFilter(capacity)
+        for jti in jtis:
+            self.bloom.add(jti)
+        self.next_rebuild = time.monotonic() + getattr(settings, "TOKEN_REVOCATION_REBUILD_INTERVAL", 60 * 10)
+
+    def _sync(self, now):
+        jtis = RevokedToken.objects.filter(
+            revoked_at__gte=self.synced_at - SYNC_OVERLAP, expires_at__gt=now
+        ).values_list("jti", flat=True)
+        for jti in jtis:
+            self.bloom.add(jti)
+
+    def _refresh(self):
+        now = timezone.now()
+        if (
+            self.bloom is None
+            or time.monotonic() >= self.next_rebuild
+            or len(self.bloom) >= self.bloom.capacity
+        ):
+            self._rebuild(now)
+        else:
+            self._sync(now)
+        self.synced_at = now
+        self.next_sync = time.monotonic() + getattr(settings, "TOKEN_REVOCATION_SYNC_INTERVAL", 5)
+
+    def might_contain(self, jti):
+        with self.lock:
+            if time.monotonic() >= self.next_sync:
+                self._refresh()
+            return jti in self.bloom
+
+    def add(self, jti):
+        with self.lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def reset(self):
+        with self.lock:
+            self.bloom = None
+            self.next_sync = 0
+
+
+revocation_filter = RevocationFilter()
+
+
+def revoke_token(token):
+    """
+    Revoke ``token`` (a validated simplejwt token) until it expires.
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    RevokedToken.objects.get_or_create(jti=jti, defaults={"expires_at": datetime_from_epoch(token["exp"])})
+    revocation_filter.add(jti)
+
+
+def is_token_revoked(token):
+    """
+    Whether ``token`` has been revoked. Only jtis the Bloom filter reports as
+    possibly revoked are confirmed against the database.
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    if jti is None or not revocation_filter.might_contain(jti):
+        return False
+    return RevokedToken.objects.filter(jti=jti, expires_at__gt=timezone.now()).exists()
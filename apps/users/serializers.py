@@ -6,7 +6,7 @@ from apps.users.messages import (
     ALREADY_EMAIL_EXIST,
     PASSWORD_CRITERIA_NOT_MET,
 )
-from rest_framework_simplejwt.tokens import RefreshToken
+from apps.users.tokens import tokens_for_user
 
 class RegisterSerializer(serializers.ModelSerializer):
     """
@@ -84,8 +84,4 @@ class UserLoginSerializer(serializers.ModelSerializer):
         """
         Get a list of tokens
         """
-        refresh = RefreshToken.for_user(obj)
-        return {
-            "refresh": str(refresh),
-            "access": str(refresh.access_token),
-        }
\ No newline at end of file
+        return tokens_for_user(obj)
\ No newline at end of file
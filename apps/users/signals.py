@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.users.cache import invalidate_cached_user
+from apps.users.models import AppUser
+from apps.users.tokens import invalidate_token_version
+
+# Changing any of these makes previously issued tokens stale.
+TOKEN_FIELDS = ("role", "is_active", "password")
+
+
+@receiver(pre_save, sender=AppUser)
+def detect_token_changes(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._token_fields_changed = False
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(TOKEN_FIELDS):
+        return
+    previous = AppUser.objects.filter(pk=instance.pk).values(*TOKEN_FIELDS).first()
+    if previous is None:
+        return
+    instance._token_fields_changed = any(previous[field] != getattr(instance, field) for field in TOKEN_FIELDS)
+
+
+@receiver(post_save, sender=AppUser)
+def bump_token_version(sender, instance, created, **kwargs):
+    if created or not getattr(instance, "_token_fields_changed", False):
+        return
+    # Incremented in the database so it also persists for update_fields saves.
+    AppUser.objects.filter(pk=instance.pk).update(token_version=F("token_version") + 1)
+    instance.token_version = AppUser.objects.values_list("token_version", flat=True).get(pk=instance.pk)
+    invalidate_token_version(instance.pk)
+    transaction.on_commit(lambda: invalidate_token_version(instance.pk))
+
+
+@receiver(post_save, sender=AppUser)
+@receiver(post_delete, sender=AppUser)
+def invalidate_user_cache(sender, instance, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    # Drop the entry right away and again after commit, so a request that
+    # re-cached the old row while the transaction was open is corrected too.
+    invalidate_cached_user(instance.pk)
+    transaction.on_commit(lambda: invalidate_cached_user(instance.pk))
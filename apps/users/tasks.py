@@ -1,13 +1,30 @@
 from celery import shared_task
-from django.core.mail import send_mail
-from django.conf import settings
+from django.utils import timezone
+
+from apps.users.mail import flush_outgoing_emails, queue_email
+from apps.users.models import RevokedToken
 
 @shared_task
 def send_activation_email_task(subject, message, recipient_email):
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[recipient_email],
-        fail_silently=False,
-    )
+    """
+    Queue a mail for the batched flush; kept for tasks enqueued before
+    activation mails were queued directly.
+    """
+    queue_email(subject, message, recipient_email)
+
+
+@shared_task
+def flush_email_queue():
+    """
+    Send queued mails over one reused SMTP connection.
+    """
+    return flush_outgoing_emails()
+
+
+@shared_task
+def purge_revoked_tokens():
+    """
+    Delete denylist entries of tokens that have expired anyway.
+    """
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
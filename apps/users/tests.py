@@ -1,3 +1,369 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.users.cache import get_cached_user, invalidate_cached_user
+from apps.users.mail import claim_emails, flush_outgoing_emails, queue_email
+from apps.users.models import AppUser, OutgoingEmail, RevokedToken
+from apps.users.revocation import is_token_revoked, revocation_filter, revoke_token
+from apps.users.tasks import purge_revoked_tokens
+from apps.users.throttling import _hash_slots, take_token
+from apps.users.tokens import get_token_version, invalidate_token_version, tokens_for_user
+from utils.bloom import BloomFilter
+from utils.permissions import IsAdmin, IsAdminOrStaff
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """
+    Authenticated users come from the cache and are invalidated on save.
+    """
+
+    def setUp(self):
+        self.user = AppUser.objects.create_user(
+            email="staff@example.com", password="Passw0rd!", first_name="Staff", role="staff"
+        )
+        self.addCleanup(invalidate_cached_user, self.user.pk)
+        self.addCleanup(invalidate_token_version, self.user.pk)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens_for_user(self.user)['access']}")
+
+    def report(self):
+        return self.client.get("/orders/reports/sales/")
+
+    def user_queries(self, queries):
+        return [query["sql"] for query in queries if "users_appuser" in query["sql"]]
+
+    def test_repeated_requests_do_not_load_the_user(self):
+        self.assertEqual(self.report().status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.report().status_code, 200)
+
+        self.assertEqual(self.user_queries(queries), [])
+
+    def test_role_change_is_picked_up(self):
+        self.assertEqual(self.report().status_code, 200)
+
+        self.user.role = "agent"
+        self.user.save()
+
+        # The token's role claim is now stale, so the token itself is rejected.
+        self.assertEqual(self.report().status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertEqual(self.report().status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.report().status_code, 401)
+
+    def test_cached_user_never_exposes_password_hash(self):
+        self.report()
+        user = AppUser.objects.get(pk=self.user.pk)
+        cached = get_cached_user(self.user.pk)
+
+        self.assertIn("password", cached.get_deferred_fields())
+        self.assertTrue(cached.check_password("Passw0rd!"))
+        self.assertEqual(cached.role, user.role)
+
+
+class TokenClaimTests(TestCase):
+    """
+    Role checks are answered from signed token claims; stale tokens are rejected.
+    """
+
+    def setUp(self):
+        self.user = AppUser.objects.create_user(
+            email="admin@example.com", password="Passw0rd!", first_name="Admin", role="admin"
+        )
+        self.addCleanup(invalidate_cached_user, self.user.pk)
+        self.addCleanup(invalidate_token_version, self.user.pk)
+
+    def test_tokens_carry_role_active_and_version(self):
+        token = AccessToken(tokens_for_user(self.user)["access"])
+
+        self.assertEqual((token["role"], token["active"], token["ver"]), ("admin", True, 1))
+
+    def test_permissions_need_no_database_access(self):
+        request = SimpleNamespace(
+            user=AppUser(pk=self.user.pk, role="agent"),
+            auth=AccessToken(tokens_for_user(self.user)["access"]),
+        )
+
+        with self.assertNumQueries(0):
+            self.assertTrue(IsAdmin().has_permission(request, None))
+            self.assertTrue(IsAdminOrStaff().has_permission(request, None))
+
+    def test_version_bumps_only_for_token_fields(self):
+        self.user.first_name = "Renamed"
+        self.user.save()
+        self.assertEqual(get_token_version(self.user.pk), 1)
+
+        self.user.set_password("N3w-Passw0rd!")
+        self.user.save()
+        self.assertEqual(get_token_version(self.user.pk), 2)
+
+    def test_stale_token_is_rejected(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens_for_user(self.user)['access']}")
+        self.assertEqual(client.get("/orders/reports/sales/").status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+        self.user.is_active = True
+        self.user.save()
+
+        self.assertEqual(client.get("/orders/reports/sales/").status_code, 401)
+
+
+class TokenRevocationTests(TestCase):
+    """
+    Revoked access tokens are rejected; unrevoked ones are checked in process.
+    """
+
+    def setUp(self):
+        revocation_filter.reset()
+        self.user = AppUser.objects.create_user(
+            email="admin@example.com", password="Passw0rd!", first_name="Admin", role="admin"
+        )
+        self.addCleanup(invalidate_cached_user, self.user.pk)
+        self.addCleanup(invalidate_token_version, self.user.pk)
+        self.tokens = tokens_for_user(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"revoked-{i}")
+
+        self.assertTrue(all(f"revoked-{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"valid-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_unrevoked_tokens_are_checked_without_queries(self):
+        token = AccessToken(self.tokens["access"])
+        self.assertFalse(is_token_revoked(token))
+
+        with self.assertNumQueries(0):
+            self.assertFalse(is_token_revoked(token))
+
+    def test_logout_revokes_access_token(self):
+        self.assertEqual(self.client.get("/orders/reports/sales/").status_code, 200)
+
+        response = self.client.generic(
+            "GET", "/users/logout/", json.dumps({"refresh": self.tokens["refresh"]}), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.client.get("/orders/reports/sales/").status_code, 401)
+        self.assertTrue(is_token_revoked(RefreshToken(self.tokens["refresh"])))
+
+    def test_revocations_from_other_processes_are_synced(self):
+        token = AccessToken(self.tokens["access"])
+        self.assertFalse(is_token_revoked(token))
+        RevokedToken.objects.create(jti=token["jti"], expires_at=timezone.now() + timedelta(minutes=5))
+
+        revocation_filter.next_sync = 0
+        self.assertTrue(is_token_revoked(token))
+
+    def test_expired_entries_are_purged(self):
+        revoke_token(AccessToken(self.tokens["access"]))
+        RevokedToken.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(purge_revoked_tokens(), 1)
+        self.assertFalse(RevokedToken.objects.exists())
+
+
+@override_settings(
+    LOGIN_THROTTLE_IP_BURST=4, LOGIN_THROTTLE_IP_PER_MINUTE=1,
+    LOGIN_THROTTLE_EMAIL_BURST=2, LOGIN_THROTTLE_EMAIL_PER_MINUTE=1,
+    LOGIN_HASH_WAIT_TIMEOUT=0,
+)
+class LoginThrottleTests(TestCase):
+    """
+    Login attempts are throttled per IP and email and hash checks are capped.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = AppUser.objects.create_user(
+            email="admin@example.com", password="Passw0rd!", first_name="Admin", role="admin"
+        )
+        self.addCleanup(invalidate_cached_user, self.user.pk)
+
+    def login(self, email="admin@example.com", password="Passw0rd!", ip="10.0.0.1"):
+        return APIClient().post(
+            "/users/login/", {"email": email, "password": password}, format="json", REMOTE_ADDR=ip
+        )
+
+    def test_token_bucket_refuses_past_burst(self):
+        results = [take_token("test:bucket", per_minute=60, burst=3) for _ in range(5)]
+
+        self.assertEqual([allowed for allowed, _ in results], [True, True, True, False, False])
+        self.assertTrue(0 < results[-1][1] <= 1)
+
+    def test_login_mints_tokens_once(self):
+        with mock.patch("apps.users.tokens.RefreshToken.for_user", wraps=RefreshToken.for_user) as for_user:
+            response = self.login()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(for_user.call_count, 1)
+        self.assertIn("access", response.json()["data"]["tokens"])
+
+    def test_email_is_throttled_without_hashing(self):
+        self.assertEqual([self.login(password="wrong", ip=f"10.0.0.{i}").status_code for i in range(2)], [400, 400])
+
+        with mock.patch.object(AppUser, "check_password") as check_password:
+            self.assertEqual(self.login(ip="10.0.0.9").status_code, 429)
+        check_password.assert_not_called()
+
+    def test_throttled_ip_does_not_drain_email_buckets(self):
+        for i in range(4):
+            self.login(email=f"victim{i}@example.com", password="wrong")
+        self.assertEqual(self.login(password="wrong").status_code, 429)
+
+        self.assertEqual(self.login(ip="10.0.0.2").status_code, 200)
+
+    def test_spoofed_forwarded_for_does_not_evade_ip_bucket(self):
+        statuses = [
+            APIClient().post(
+                "/users/login/", {"email": f"victim{i}@example.com", "password": "wrong"}, format="json",
+                REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=f"198.51.100.{i}",
+            ).status_code
+            for i in range(6)
+        ]
+
+        self.assertEqual(statuses, [400] * 4 + [429] * 2)
+
+    def test_saturated_hash_slots_return_503(self):
+        while _hash_slots.acquire(blocking=False):
+            self.addCleanup(_hash_slots.release)
+
+        self.assertEqual(self.login().status_code, 503)
+
+
+class FlakyEmailBackend(EmailBackend):
+    """
+    locmem backend that counts opened connections and bounces some recipients.
+    """
+
+    opened = 0
+    is_open = False
+    unreachable = False
+
+    def open(self):
+        if self.is_open:
+            return False
+        if FlakyEmailBackend.unreachable:
+            raise ConnectionRefusedError("Connection refused")
+        FlakyEmailBackend.opened += 1
+        self.is_open = True
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, messages):
+        if any(recipient.startswith("bounce") for message in messages for recipient in message.to):
+            raise ConnectionError("Mailbox unavailable")
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_MAX_ATTEMPTS=2, EMAIL_RETRY_DELAY=60, DEFAULT_FROM_EMAIL="noreply@example.com")
+class EmailQueueTests(TestCase):
+    """
+    Queued mails are flushed in batches over one connection and retried per message.
+    """
+
+    def setUp(self):
+        FlakyEmailBackend.opened = 0
+        FlakyEmailBackend.unreachable = False
+        patcher = mock.patch("apps.users.mail.get_connection", side_effect=lambda **kwargs: FlakyEmailBackend(**kwargs))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_registration_queues_activation_email(self):
+        response = APIClient().post("/users/register/", {
+            "email": "new@example.com", "password": "Passw0rd!", "first_name": "New", "last_name": "User",
+        }, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(list(OutgoingEmail.objects.values_list("recipient", flat=True)), ["new@example.com"])
+
+    def test_flush_sends_batches_over_one_connection(self):
+        for i in range(5):
+            queue_email("Activate", "Link", f"user{i}@example.com")
+
+        self.assertEqual(flush_outgoing_emails(batch_size=2), {"sent": 5, "failed": 0})
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(FlakyEmailBackend.opened, 1)
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    def test_failed_messages_are_retried_alone(self):
+        queue_email("Activate", "Link", "ok@example.com")
+        bounce = queue_email("Activate", "Link", "bounce@example.com")
+
+        self.assertEqual(flush_outgoing_emails(), {"sent": 1, "failed": 1})
+        bounce.refresh_from_db()
+        self.assertEqual((bounce.status, bounce.attempts), (OutgoingEmail.QUEUED, 1))
+        self.assertIn("Mailbox unavailable", bounce.last_error)
+
+        # Not due yet, then given up after the last attempt.
+        self.assertEqual(flush_outgoing_emails(), {"sent": 0, "failed": 0})
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        flush_outgoing_emails()
+        bounce.refresh_from_db()
+        self.assertEqual((bounce.status, bounce.attempts), (OutgoingEmail.FAILED, 2))
+        self.assertEqual([message.to for message in mail.outbox], [["ok@example.com"]])
+
+    def test_bounce_does_not_stop_later_batches(self):
+        bounce = queue_email("Activate", "Link", "bounce@example.com")
+        for i in range(2):
+            queue_email("Activate", "Link", f"user{i}@example.com")
+
+        self.assertEqual(flush_outgoing_emails(batch_size=1), {"sent": 2, "failed": 1})
+        self.assertEqual(list(OutgoingEmail.objects.values_list("id", "attempts")), [(bounce.id, 1)])
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_claimed_mails_are_hidden_until_released(self):
+        email = queue_email("Activate", "Link", "user@example.com")
+        now = timezone.now()
+        self.assertEqual(claim_emails(now, 0, 10, 300), [email])
+        self.assertEqual(claim_emails(now, 0, 10, 300), [])
+
+        OutgoingEmail.objects.update(next_attempt_at=now)
+        FlakyEmailBackend.unreachable = True
+        with self.assertLogs("apps.users.mail", "WARNING"):
+            flush_outgoing_emails()
+        email.refresh_from_db()
+        self.assertLessEqual(email.next_attempt_at, timezone.now())
+
+    def test_unreachable_server_does_not_use_up_attempts(self):
+        for i in range(3):
+            queue_email("Activate", "Link", f"user{i}@example.com")
+        FlakyEmailBackend.unreachable = True
+
+        with self.assertLogs("apps.users.mail", "WARNING"):
+            for _ in range(3):
+                self.assertEqual(flush_outgoing_emails(batch_size=1), {"sent": 0, "failed": 0})
+        self.assertEqual(
+            list(OutgoingEmail.objects.values_list("status", "attempts")), [(OutgoingEmail.QUEUED, 0)] * 3
+        )
+
+        FlakyEmailBackend.unreachable = False
+        self.assertEqual(flush_outgoing_emails(), {"sent": 3, "failed": 0})
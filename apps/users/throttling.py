@@ -0,0 +1,104 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+LOGIN_THROTTLE_KEY = "users:login_throttle:{scope}:{ident}"
+
+
+def take_token(key, per_minute, burst):
+    """
+    Take one token from the bucket stored under ``key``, which holds up to
+    ``burst`` tokens and refills at ``per_minute`` tokens a minute.
+
+    Returns ``(allowed, wait)`` where ``wait`` is the number of seconds until
+    a token is available again. The bucket is kept as its theoretical arrival
+    time in milliseconds (GCRA). Spending and refunding tokens use the cache's
+    atomic incr/decr, so concurrent workers cannot both spend the last token
+    of a drained bucket.
+
+    Once a bucket has been idle long enough to be full again, its arrival
+    time has fallen behind ``now`` and is reset with a plain ``set``, which
+    is not atomic: requests racing that reset may overwrite each other's
+    increments. A client can therefore spend at most one extra token per
+    concurrent request, and only on a bucket that was already full; a bucket
+    under sustained load never takes that path.
+    """
+    interval = int(60 * 1000 / per_minute)
+    timeout = burst * interval // 1000 + 1
+    now = int(time.time() * 1000)
+    cache.add(key, now, timeout=timeout)
+    try:
+        arrival = cache.incr(key, interval)
+    except ValueError:
+        # Expired between add and incr
+        arrival = None
+    if arrival is None or arrival < now + interval:
+        # The bucket was full, i.e. the arrival time had fallen behind.
+        arrival = now + interval
+        cache.set(key, arrival, timeout=timeout)
+    if arrival - now > burst * interval:
+        # Rejected attempts do not spend a token.
+        cache.decr(key, interval)
+        return False, (arrival - now - burst * interval) / 1000
+    cache.touch(key, timeout=timeout)
+    return True, None
+
+
+class LoginThrottle(BaseThrottle):
+    """
+    Token bucket throttling of login attempts per client IP and per email.
+
+    The IP bucket is checked first, so a client that is already throttled
+    does not drain the buckets of the accounts it is trying.
+    """
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        buckets = [(
+            "ip", self.get_ident(request),
+            getattr(settings, "LOGIN_THROTTLE_IP_PER_MINUTE", 10),
+            getattr(settings, "LOGIN_THROTTLE_IP_BURST", 30),
+        )]
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if isinstance(email, str) and email:
+            buckets.append((
+                "email", hashlib.sha256(email.strip().lower().encode()).hexdigest(),
+                getattr(settings, "LOGIN_THROTTLE_EMAIL_PER_MINUTE", 2),
+                getattr(settings, "LOGIN_THROTTLE_EMAIL_BURST", 5),
+            ))
+        for scope, ident, per_minute, burst in buckets:
+            allowed, wait = take_token(LOGIN_THROTTLE_KEY.format(scope=scope, ident=ident), per_minute, burst)
+            if not allowed:
+                self.retry_after = wait
+                return False
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class HashCapacityExceeded(Exception):
+    pass
+
+
+# Password hashing is deliberately CPU bound; bounding how many requests of
+# one worker hash at the same time keeps the rest of the API responsive.
+_hash_slots = threading.BoundedSemaphore(getattr(settings, "LOGIN_MAX_CONCURRENT_HASHES", 2))
+
+
+def check_password_limited(user, password):
+    """
+    ``user.check_password(password)`` using one of this worker's hashing slots.
+    Raises HashCapacityExceeded if no slot frees up within
+    LOGIN_HASH_WAIT_TIMEOUT seconds.
+    """
+    if not _hash_slots.acquire(timeout=getattr(settings, "LOGIN_HASH_WAIT_TIMEOUT", 2)):
+        raise HashCapacityExceeded()
+    try:
+        return user.check_password(password)
+    finally:
+        _hash_slots.release()
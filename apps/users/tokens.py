@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Mod
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.users.models import AppUser
+
+ROLE_CLAIM = "role"
+ACTIVE_CLAIM = "active"
+VERSION_CLAIM = "ver"
+
+TOKEN_VERSION_KEY = "users:token_versions:{shard}"
+TOKEN_VERSION_SHARDS = 64
+
+
+def tokens_for_user(user):
+    """
+    Issue a refresh/access token pair carrying the user's role, active flag
+    and token version, so permission checks need no database access.
+    Access tokens minted from the refresh token copy these claims.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh[ROLE_CLAIM] = user.role
+    refresh[ACTIVE_CLAIM] = user.is_active
+    refresh[VERSION_CLAIM] = user.token_version
+    return {
+        "refresh": str(refresh),
+        "access": str(refresh.access_token),
+    }
+
+
+def _shard(user_id):
+    return int(user_id) % TOKEN_VERSION_SHARDS
+
+
+def get_token_version(user_id):
+    """
+    Current token version of ``user_id``.
+
+    Versions live in a compact map split into TOKEN_VERSION_SHARDS cache
+    entries, each holding only the users whose version was ever bumped;
+    everybody else is at the default version 1. A missing shard is rebuilt
+    from the database.
+    """
+    shard = _shard(user_id)
+    key = TOKEN_VERSION_KEY.format(shard=shard)
+    versions = cache.get(key)
+    if versions is None:
+        versions = dict(
+            AppUser.objects.annotate(shard=Mod("id", TOKEN_VERSION_SHARDS))
+            .filter(shard=shard, token_version__gt=1)
+            .values_list("id", "token_version")
+        )
+        cache.set(key, versions, timeout=getattr(settings, "TOKEN_VERSION_CACHE_TIMEOUT", 60 * 60))
+    return versions.get(int(user_id), 1)
+
+
+def invalidate_token_version(user_id):
+    """
+    Drop the version map shard of ``user_id`` so it is rebuilt from the database.
+    """
+    cache.delete(TOKEN_VERSION_KEY.format(shard=_shard(user_id)))
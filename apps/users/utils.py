@@ -2,7 +2,7 @@ from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.urls import reverse
 from django.contrib.auth.tokens import default_token_generator
-from apps.users.tasks import send_activation_email_task
+from apps.users.mail import queue_email
 
 
 def generate_activation_token(user):
@@ -30,4 +30,4 @@ def send_activation_email(user, request):
 
     If you didn't register, just ignore this email.
     """
-    send_activation_email_task.delay(subject, message, user.email)
+    queue_email(subject, message, user.email)
@@ -1,4 +1,5 @@
 from django.shortcuts import render
+from rest_framework import status
 from rest_framework.views import APIView
 from django.contrib.auth import logout
 from apps.users.models import AppUser
@@ -9,6 +10,7 @@ from apps.users.messages import (
    INVALID_CREDENTIALS,
    LOGIN_SUCCESSFUL,
    LOGIN_FAILED,
+   LOGIN_BUSY,
    INVALID_REFRESH_TOKEN,
    LOGOUT_SUCCESSFUL,
     ACTIVATION_FAILED,
@@ -16,6 +18,8 @@ from apps.users.messages import (
 from utils.mixins import ResponseViewMixin
 from rest_framework_simplejwt.tokens import RefreshToken
 from apps.users.utils import send_activation_email
+from apps.users.revocation import revoke_token
+from apps.users.throttling import HashCapacityExceeded, LoginThrottle, check_password_limited
 from django.utils.http import urlsafe_base64_decode
 from django.contrib.auth.tokens import default_token_generator
 
@@ -47,6 +51,7 @@ class LoginView(APIView, ResponseViewMixin):
     Login View
     """
     permission_classes = []
+    throttle_classes = [LoginThrottle]
 
     def post(self, request):
         try:
@@ -55,7 +60,7 @@ class LoginView(APIView, ResponseViewMixin):
             email = serializer.validated_data.get("email")
             password = serializer.validated_data.get("password")
             user = AppUser.objects.filter(email=email).first()
-            if user is None or not user.check_password(password):
+            if user is None or not check_password_limited(user, password):
                 return self.error_response(
                     message=INVALID_CREDENTIALS,
                     data={},
@@ -65,13 +70,17 @@ class LoginView(APIView, ResponseViewMixin):
                     message=ACTIVATION_FAILED,
                     data={}
                 )
-            if user is not None:
-                RefreshToken.for_user(user)
 
             return self.success_response(
                 data=UserLoginSerializer(user).data,
                 message=LOGIN_SUCCESSFUL,
             )
+        except HashCapacityExceeded:
+            return self.error_response(
+                code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                message=LOGIN_BUSY,
+                data={},
+            )
         except Exception as e:
                 return self.error_response(
                     message=LOGIN_FAILED, data=str(e))
@@ -86,7 +95,9 @@ class LogoutView(APIView, ResponseViewMixin):
     def get(self, request):
         try:
             refresh = RefreshToken(request.data.get("refresh"))
-            refresh.blacklist()
+            revoke_token(refresh)
+            if request.auth is not None:
+                revoke_token(request.auth)
         except Exception as e:
             return self.error_response(
                 message=INVALID_REFRESH_TOKEN, data=str(e)
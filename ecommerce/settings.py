@@ -66,10 +66,14 @@ ROOT_URLCONF = 'ecommerce.urls'
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
     "EXCEPTION_HANDLER": "utils.handlers.exception_handler",
+    # Reverse proxies in front of the app. Throttles identify clients by the
+    # address the last of them saw, never by the client supplied
+    # X-Forwarded-For entries; with 0 only REMOTE_ADDR is used.
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", 0)),
 }
 
 TEMPLATES = [
@@ -90,9 +94,86 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'ecommerce.wsgi.application'
 
+# Keyset pagination defaults for list endpoints
+PAGINATION_PAGE_SIZE = 50
+PAGINATION_MAX_PAGE_SIZE = 500
+
+# Rows fetched per database round trip by streaming exports
+EXPORT_CHUNK_SIZE = 2000
+
+# Bulk product import limits
+BULK_PRODUCT_MAX_ROWS = 5000
+BULK_CREATE_BATCH_SIZE = 500
+BULK_APPROVAL_MAX_ITEMS = 1000
+
+# Dotted path to a product search backend; None picks the native full text
+# backend for the database vendor (see apps.core.search).
+PRODUCT_SEARCH_BACKEND = None
+
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
 
+CELERY_BEAT_SCHEDULE = {
+    # Picks up intakes whose on-commit drain was lost, e.g. to a broker outage.
+    "drain-order-intake": {
+        "task": "apps.orders.tasks.drain_order_intake",
+        "schedule": 30.0,
+    },
+    "release-expired-stock-reservations": {
+        "task": "apps.orders.tasks.release_expired_reservations",
+        "schedule": 60.0,
+    },
+    "purge-expired-idempotency-keys": {
+        "task": "apps.orders.tasks.purge_expired_idempotency_keys",
+        "schedule": 60.0 * 60,
+    },
+    "update-sales-rollups": {
+        "task": "apps.orders.tasks.update_sales_rollups",
+        "schedule": 60.0 * 5,
+    },
+    "archive-old-orders": {
+        "task": "apps.orders.tasks.archive_old_orders",
+        "schedule": 60.0 * 60 * 24,
+    },
+    "snapshot-top-sellers": {
+        "task": "apps.orders.tasks.snapshot_top_sellers",
+        "schedule": 60.0 * 10,
+    },
+    "flush-email-queue": {
+        "task": "apps.users.tasks.flush_email_queue",
+        "schedule": 30.0,
+    },
+    "purge-revoked-tokens": {
+        "task": "apps.users.tasks.purge_revoked_tokens",
+        "schedule": 60.0 * 60,
+    },
+}
+
+# Seconds a cart's stock reservation is held before it is released
+STOCK_RESERVATION_TTL = 15 * 60
+
+# Queue item orders for drain_order_intake instead of placing them in the request
+ORDER_ASYNC_INTAKE = os.environ.get('ORDER_ASYNC_INTAKE', 'false').lower() == 'true'
+# Orders placed per worker transaction by drain_order_intake
+ORDER_INTAKE_BATCH_SIZE = 100
+
+# Orders folded into the daily sales rollups per transaction
+SALES_ROLLUP_BATCH_SIZE = 1000
+# Orders younger than this many seconds are left for the next rollup run
+SALES_ROLLUP_LAG = 60
+
+# Orders older than this many days are moved to the archive tables
+ORDER_ARCHIVE_AFTER_DAYS = 365
+# Orders moved to the archive per transaction
+ORDER_ARCHIVE_BATCH_SIZE = 500
+
+# Bounds of the in-process cache of rendered order detail responses
+ORDER_DETAIL_CACHE_MAX_ENTRIES = 10000
+ORDER_DETAIL_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Seconds the response of a request with an Idempotency-Key is kept for replay
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
 
 
 
@@ -107,6 +188,28 @@ DATABASES = {
 }
 
 
+# Cache
+# A shared backend (Redis) keeps cache versions consistent across workers;
+# without CACHE_LOCATION each process falls back to its own local memory.
+
+if os.environ.get("CACHE_LOCATION"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("CACHE_LOCATION"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+CATEGORY_LIST_CACHE_TIMEOUT = 60 * 60
+PRODUCT_FACETS_CACHE_TIMEOUT = 60 * 10
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -165,6 +268,32 @@ SIMPLE_JWT = {
 
 AUTH_USER_MODEL = "users.AppUser"
 
+# Authenticated users are cached in the shared cache for AUTH_USER_CACHE_TIMEOUT
+# seconds and in each process for AUTH_USER_LOCAL_CACHE_TTL seconds, which
+# bounds how long another process may still see a deactivated user or old role.
+AUTH_USER_CACHE_TIMEOUT = 60 * 5
+AUTH_USER_LOCAL_CACHE_TTL = 5
+AUTH_USER_LOCAL_CACHE_SIZE = 10000
+# Seconds a shard of the token version map stays cached before it is rebuilt
+TOKEN_VERSION_CACHE_TIMEOUT = 60 * 60
+# Each process checks token revocations against a Bloom filter of revoked jtis
+# that picks up new revocations every TOKEN_REVOCATION_SYNC_INTERVAL seconds
+# and is rebuilt, dropping expired tokens, every TOKEN_REVOCATION_REBUILD_INTERVAL.
+TOKEN_REVOCATION_SYNC_INTERVAL = 5
+TOKEN_REVOCATION_REBUILD_INTERVAL = 60 * 10
+TOKEN_REVOCATION_FILTER_CAPACITY = 100000
+
+# Login attempts are throttled with token buckets per client IP and per email:
+# up to *_BURST attempts at once, refilled at *_PER_MINUTE attempts a minute.
+LOGIN_THROTTLE_IP_BURST = 30
+LOGIN_THROTTLE_IP_PER_MINUTE = 10
+LOGIN_THROTTLE_EMAIL_BURST = 5
+LOGIN_THROTTLE_EMAIL_PER_MINUTE = 2
+# Password hash verifications running at once per worker process, and the
+# seconds a login waits for a free slot before it is answered with 503
+LOGIN_MAX_CONCURRENT_HASHES = 2
+LOGIN_HASH_WAIT_TIMEOUT = 2
+
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
@@ -173,3 +302,13 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+
+# Queued mails claimed per batch by flush_email_queue; a failed mail is
+# retried after EMAIL_RETRY_DELAY seconds, doubling per attempt, and given
+# up after EMAIL_MAX_ATTEMPTS attempts. A claimed batch is hidden from other
+# workers for EMAIL_CLAIM_TIMEOUT seconds, after which a crashed worker's
+# mails become due again
+EMAIL_BATCH_SIZE = 100
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_DELAY = 60
+EMAIL_CLAIM_TIMEOUT = 60 * 5
@@ -0,0 +1,71 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    Thread safe in-process LRU cache bounded by entry count and, optionally,
+    by the total size of its values as reported by ``sizeof``.
+
+    Reads move an entry to the most recently used end; inserts evict from the
+    least recently used end until both bounds hold again.
+    """
+
+    def __init__(self, max_entries, max_bytes=None, sizeof=len):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                self.entries.move_to_end(key)
+            except KeyError:
+                return default
+            return self.entries[key][0]
+
+    def set(self, key, value):
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self.entries[key] = (value, size)
+            self.size += size
+            self._evict()
+
+    def add(self, key, value):
+        """
+        Insert ``value`` unless ``key`` is already cached (write-once).
+        """
+        with self.lock:
+            if key in self.entries:
+                return
+        self.set(key, value)
+
+    def delete(self, key):
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _evict(self):
+        while self.entries and (
+            len(self.entries) > self.max_entries
+            or (self.max_bytes is not None and self.size > self.max_bytes)
+        ):
+            _, (_, size) = self.entries.popitem(last=False)
+            self.size -= size
@@ -1,26 +1,112 @@
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.http import parse_etags
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
 
 class ResponseViewMixin(object):
 
     @classmethod
-    def response(cls, code, message=None, data=None):
+    def response(cls, code, message=None, data=None, pagination=None):
+        body = {
+            'message': message,
+            'status': code,
+            'data': data
+        }
+        if pagination is not None:
+            body['pagination'] = pagination
         return Response(
             headers={'status': code},
             status=code,
-            data={
-                'message': message,
-                'status': code,
-                'data': data
-            },
+            data=body,
+            content_type='application/json'
+        )
+
+    @classmethod
+    def render_envelope(cls, code=status.HTTP_200_OK, message=None, data=None):
+        """
+        Render the response envelope to JSON bytes so it can be cached and
+        replayed later with ``rendered_response``.
+        """
+        return JSONRenderer().render({
+            'message': message,
+            'status': code,
+            'data': data
+        })
+
+    @classmethod
+    def rendered_response(cls, content, code=status.HTTP_200_OK):
+        return HttpResponse(
+            content,
+            headers={'status': code},
+            status=code,
             content_type='application/json'
         )
 
+    @staticmethod
+    def make_etag(uuid, updated_at, version=None):
+        """
+        Strong ETag for a TimeStampModel row, derived from its uuid and updated_at.
+        ``version`` covers representations that also change with other rows.
+        """
+        value = f"{uuid}:{updated_at.isoformat()}"
+        if version is not None:
+            value += f":{version}"
+        digest = hashlib.md5(value.encode(), usedforsecurity=False).hexdigest()
+        return f'"{digest}"'
+
+    @classmethod
+    def set_etag(cls, response, instance):
+        response['ETag'] = cls.make_etag(instance.uuid, instance.updated_at)
+        return response
+
+    @classmethod
+    def not_modified_response(cls, request, etag):
+        """
+        Return a 304 response when the request's If-None-Match matches ``etag``,
+        otherwise None.
+        """
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        return None
+
+    @classmethod
+    def evaluate_preconditions(cls, request, instance, version=None):
+        """
+        Evaluate If-None-Match / If-Match against ``instance``, the row the view
+        has already loaded, so conditional GETs are answered without serializing
+        it. ``version`` is passed on to ``make_etag``. Returns a 304 or 412
+        response when the request should stop here, otherwise None.
+        """
+        if instance is None:
+            return None
+        etag = cls.make_etag(instance.uuid, instance.updated_at, version)
+
+        if request.method in ('GET', 'HEAD'):
+            return cls.not_modified_response(request, etag)
+        else:
+            if_match = request.headers.get('If-Match')
+            if if_match and if_match.strip() != '*' and etag not in parse_etags(if_match):
+                response = cls.error_response(
+                    code=status.HTTP_412_PRECONDITION_FAILED,
+                    message="Resource has been modified",
+                )
+                response['ETag'] = etag
+                return response
+        return None
+
     @classmethod
     def success_response(cls, code=status.HTTP_200_OK, message=None, data=None):
         return cls.response(code, message, data)
 
+    @classmethod
+    def paginated_response(cls, pagination, code=status.HTTP_200_OK, message=None, data=None):
+        return cls.response(code, message, data, pagination=pagination)
+
     @classmethod
     def error_response(cls, code=status.HTTP_400_BAD_REQUEST, message=None, data=None):
         return cls.response(code, message, data)
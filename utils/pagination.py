@@ -0,0 +1,105 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(Exception):
+    """
+    Raised when a client supplied cursor cannot be decoded.
+    """
+
+
+class KeysetPaginator(object):
+    """
+    Cursor (keyset) pagination over the ``(created_at, id)`` columns.
+
+    Every page is fetched with a ``WHERE (created_at, id) > (cursor)`` style
+    predicate instead of an OFFSET, so the cost of a page only depends on the
+    page size and not on how deep into the table the client has walked.
+    The cursor handed to clients is an opaque url-safe token.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def __init__(self, page_size=None, max_page_size=None, descending=False):
+        self.page_size = page_size or getattr(settings, "PAGINATION_PAGE_SIZE", 50)
+        self.max_page_size = max_page_size or getattr(settings, "PAGINATION_MAX_PAGE_SIZE", 500)
+        self.descending = descending
+
+    @staticmethod
+    def encode_cursor(created_at, pk):
+        payload = json.dumps([created_at.isoformat(), pk], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+            raise InvalidCursor(cursor)
+        if created_at is None:
+            raise InvalidCursor(cursor)
+        return created_at, pk
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def paginate(self, queryset, request, cursor=None, page_size=None):
+        """
+        Return ``(rows, pagination)`` for the page selected by ``request``.
+
+        ``pagination`` is the metadata dict carried in the response envelope.
+        ``queryset`` may also be a ``values()`` queryset as long as it selects
+        ``created_at`` and ``id``. ``cursor`` and ``page_size`` override the
+        request's values, e.g. to continue a page in a second queryset.
+        Raises ``InvalidCursor`` for malformed cursors.
+        """
+        page_size = page_size or self.get_page_size(request)
+        if self.descending:
+            queryset = queryset.order_by("-created_at", "-id")
+        else:
+            queryset = queryset.order_by("created_at", "id")
+
+        if cursor is None:
+            cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            if self.descending:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                )
+
+        # Fetch one extra row to learn whether another page exists.
+        rows = list(queryset[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = None
+        if has_next:
+            last = rows[-1]
+            if isinstance(last, dict):
+                next_cursor = self.encode_cursor(last["created_at"], last["id"])
+            else:
+                next_cursor = self.encode_cursor(last.created_at, last.pk)
+
+        pagination = {
+            "next": next_cursor,
+            "has_next": has_next,
+            "page_size": page_size,
+            "count": len(rows),
+        }
+        return rows, pagination
@@ -1,20 +1,43 @@
 from rest_framework.permissions import BasePermission
 
+from apps.users.tokens import ACTIVE_CLAIM, ROLE_CLAIM
+
+
+def get_claim(request, name, user_attribute):
+    """
+    Read ``name`` from the validated token claims, so the check needs no
+    database access; falls back to ``request.user`` for requests whose
+    credentials carry no such claim (e.g. tokens issued before the claim
+    existed or session authentication).
+    """
+    auth = request.auth
+    if auth is not None and hasattr(auth, "get"):
+        value = auth.get(name)
+        if value is not None:
+            return value
+    return getattr(request.user, user_attribute)
+
+
+def has_role(request, *roles):
+    return (
+        request.user.is_authenticated
+        and get_claim(request, ACTIVE_CLAIM, "is_active")
+        and get_claim(request, ROLE_CLAIM, "role") in roles
+    )
+
+
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == 'admin'
+        return has_role(request, 'admin')
 
 class IsStaff(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == 'staff'
+        return has_role(request, 'staff')
 
 class IsAgent(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == 'agent'
+        return has_role(request, 'agent')
     
 class IsAdminOrStaff(BasePermission):
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated and 
-            (request.user.role == 'admin' or request.user.role == 'staff')
-        )
+        return has_role(request, 'admin', 'staff')
@@ -0,0 +1,141 @@
+import decimal
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+def decimal_converter(field):
+    """
+    Equivalent of ``DecimalField.to_representation`` with the quantize
+    exponent and context built once instead of on every call.
+    """
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return "{:f}".format(value.quantize(exponent, rounding=rounding, context=context))
+    return convert
+
+
+def datetime_converter(field):
+    """
+    Equivalent of ``DateTimeField.to_representation`` for ISO 8601 output of
+    aware datetimes; anything else is delegated to the field.
+
+    Returns a factory taking the current timezone, which is resolved once per
+    batch of rows rather than once per value.
+    """
+    fallback = field.to_representation
+
+    def bind(current_timezone):
+        def convert(value):
+            if isinstance(value, str) or not timezone.is_aware(value):
+                return fallback(value)
+            value = value.astimezone(current_timezone).isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+        return convert
+    return bind
+
+
+class ValuesSerializer(object):
+    """
+    Read-only serializer for list endpoints, compiled from a DRF serializer.
+
+    Rows are fetched with ``values()`` and turned into dicts in a tight loop
+    using one pre-resolved converter per field, skipping model instantiation
+    and DRF's per-field machinery. Output is identical to
+    ``serializer_class(queryset, many=True).data``: the same keys in the same
+    order, with every value rendered exactly as the DRF field renders it.
+
+    Nested serializers and ``source='*'`` fields are not supported and must be
+    listed in ``exclude`` (and filled in by the caller).
+    """
+
+    def __init__(self, serializer_class, exclude=()):
+        self.serializer_class = serializer_class
+        self.exclude = set(exclude)
+
+    @staticmethod
+    def get_converter(field):
+        """
+        Return ``(converter, bind)`` for ``field``. ``converter`` is None for
+        values passed through unchanged; when ``bind`` is True it is a factory
+        that must first be called with the current timezone.
+        """
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+            return None, False
+        if isinstance(field, serializers.UUIDField) and field.uuid_format == "hex_verbose":
+            return str, False
+        if type(field) is serializers.CharField:
+            return str, False
+        if type(field) is serializers.IntegerField:
+            return int, False
+        if type(field) is serializers.BooleanField:
+            return bool, False
+        if (
+            type(field) is serializers.DecimalField
+            and field.decimal_places is not None
+            and getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+            and not field.localize
+            and not field.normalize_output
+        ):
+            return decimal_converter(field), False
+        if (
+            type(field) is serializers.DateTimeField
+            and settings.USE_TZ
+            and not hasattr(field, "timezone")
+            and getattr(field, "format", api_settings.DATETIME_FORMAT) == ISO_8601
+        ):
+            return datetime_converter(field), True
+        return field.to_representation, False
+
+    @cached_property
+    def compiled(self):
+        compiled = []
+        for name, field in self.serializer_class().fields.items():
+            if field.write_only or name in self.exclude:
+                continue
+            if isinstance(field, serializers.BaseSerializer) or field.source == "*":
+                raise ImproperlyConfigured(
+                    f"{self.serializer_class.__name__}.{name} cannot be rendered from values()"
+                )
+            converter, bind = self.get_converter(field)
+            compiled.append((name, field.source.replace(".", "__"), converter, bind))
+        return compiled
+
+    @cached_property
+    def lookups(self):
+        return [lookup for _, lookup, _, _ in self.compiled]
+
+    def serialize_rows(self, rows):
+        """
+        Serialize dicts that contain (at least) every lookup in ``lookups``.
+        """
+        current_timezone = timezone.get_current_timezone()
+        fields = [
+            (name, lookup, converter(current_timezone) if bind else converter)
+            for name, lookup, converter, bind in self.compiled
+        ]
+        data = []
+        append = data.append
+        for row in rows:
+            item = {}
+            for name, lookup, convert in fields:
+                value = row[lookup]
+                item[name] = value if convert is None or value is None else convert(value)
+            append(item)
+        return data
+
+    def serialize(self, queryset):
+        return self.serialize_rows(queryset.values(*self.lookups))